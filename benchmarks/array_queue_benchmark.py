@@ -0,0 +1,120 @@
+import pickle
+import sys
+import timeit
+import numpy as np
+from collections import deque
+from pyutils.array_queue import FloatArrayQueue, ContiguousFloatArrayQueue
+
+CAPACITIES = [10 ** exponent for exponent in range(2, 8)]
+
+class DequeQueue:
+    # collections.deque baseline exposing the ArrayQueue interface.
+    def __init__(self, array_capacity: int) -> None:
+        self.queue = deque(maxlen=array_capacity)
+
+    def push_back(self, value: float) -> None:
+        self.queue.append(value)
+
+    def pop_front(self) -> float:
+        return self.queue.popleft()
+
+    def extend_back(self, values: np.ndarray) -> None:
+        self.queue.extend(values.tolist())
+
+    def pop_front_n(self, n: int) -> np.ndarray:
+        return np.fromiter((self.queue.popleft() for _ in range(n)), dtype=float, count=n)
+
+    def get_data(self) -> np.ndarray:
+        return np.fromiter(self.queue, dtype=float, count=len(self.queue))
+
+    def __iter__(self) -> any:
+        return iter(self.queue)
+
+class RollQueue:
+    # numpy.roll baseline - a fixed window shifted on every push (pops are not supported).
+    def __init__(self, array_capacity: int) -> None:
+        self.array = np.zeros(shape=(array_capacity,), dtype=float)
+
+    def push_back(self, value: float) -> None:
+        self.array = np.roll(self.array, -1)
+        self.array[-1] = value
+
+    def extend_back(self, values: np.ndarray) -> None:
+        self.array = np.roll(self.array, -values.shape[0])
+        self.array[-values.shape[0]:] = values
+
+    def get_data(self) -> np.ndarray:
+        return self.array.copy()
+
+    def __iter__(self) -> any:
+        return iter(self.array)
+
+QUEUE_TYPES = {
+    "ArrayQueue": FloatArrayQueue,
+    "ContiguousArrayQueue": ContiguousFloatArrayQueue,
+    "deque": DequeQueue,
+    "numpy.roll": RollQueue
+}
+
+def push_back_loop(queue: any, block: np.ndarray) -> None:
+    # Scalar counterpart of extend_back.
+    for value in block:
+        queue.push_back(value)
+
+def push_pop_loop(queue: any, block: np.ndarray) -> None:
+    # Scalar counterpart of extend_back followed by pop_front_n.
+    for value in block:
+        queue.push_back(value)
+
+    for _ in range(block.shape[0]):
+        queue.pop_front()
+
+BENCHMARKS = { # { name: (benchmark, required queue methods) }
+    "push_back_loop": (push_back_loop, ("push_back",)),
+    "extend_back": (lambda queue, block: queue.extend_back(block), ("extend_back",)),
+    "push_pop_loop": (push_pop_loop, ("push_back", "pop_front")),
+    "extend_pop_n": (lambda queue, block: (queue.extend_back(block), queue.pop_front_n(block.shape[0])),
+            ("extend_back", "pop_front_n")),
+    "get_data": (lambda queue, block: queue.get_data(), ("get_data",)),
+    "iterate": (lambda queue, block: deque(queue, maxlen=0), ("__iter__",)),
+    "pickle": (lambda queue, block: pickle.loads(pickle.dumps(queue, protocol=pickle.HIGHEST_PROTOCOL)), ())
+}
+
+def run(capacities: list = CAPACITIES, block_size: int = 1000, repeat: int = 3, seed: int = 0) -> dict:
+    """ Times each benchmark against full queues of each type and capacity and returns the best
+    time per call (s) by (capacity, queue type, benchmark), or None if the queue type lacks a required method.
+    The scalar loops and bulk operations move the same block of block_size values.
+    """
+    timings = dict()
+    random_state = np.random.RandomState(seed)
+
+    for array_capacity in capacities:
+        values = random_state.rand(array_capacity)
+        block = values[:min(block_size, array_capacity)].copy()
+
+        for queue_name, queue_type in QUEUE_TYPES.items():
+            for benchmark_name, (benchmark, methods) in BENCHMARKS.items():
+                if not all(hasattr(queue_type, method) for method in methods):
+                    timings[(array_capacity, queue_name, benchmark_name)] = None
+                    continue
+
+                queue = queue_type(array_capacity)
+                queue.extend_back(values)
+                timer = timeit.Timer(lambda: benchmark(queue, block))
+                number, _ = timer.autorange()
+                timings[(array_capacity, queue_name, benchmark_name)] = \
+                        min(timer.repeat(repeat=repeat, number=number)) / number
+
+    return timings
+
+if __name__ == "__main__":
+    capacities = [int(float(arg)) for arg in sys.argv[1:]] or CAPACITIES
+    print(f"{'capacity':>10}  {'queue':<24}" + "".join(f"{name:>16}" for name in BENCHMARKS))
+    timings = run(capacities)
+
+    for array_capacity in capacities:
+        for queue_name in QUEUE_TYPES:
+            row = [timings.get((array_capacity, queue_name, name)) for name in BENCHMARKS]
+            print(f"{array_capacity:>10}  {queue_name:<24}" + "".join(
+                f"{'-':>16}" if timing is None else f"{timing * 1e6:>14.2f}us" for timing in row
+            ))
@@ -0,0 +1,159 @@
+import bisect
+import heapq
+import random
+import sys
+import timeit
+from pyutils.sorted_dict import SortedDictBase, SortedDict
+from pyutils.sorted_dict.priority_dict import PriorityDict, DaryPriorityDict
+
+SIZES = [10 ** exponent for exponent in range(2, 6)]
+
+class ReferenceSortedDict:
+    # dict + bisect.insort model of SortedDict - O(n) updates, ties ordered most recently set first.
+    def __init__(self, _comparator: callable = SortedDictBase.min_comparator) -> None:
+        self.sign = 1 if _comparator is SortedDictBase.min_comparator else -1
+        self.entries = dict() # { k: (sign * v, -order, k) }
+        self.container = [] # sorted entries
+        self.order = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, key: any) -> bool:
+        return key in self.entries
+
+    def __getitem__(self, key: any) -> any:
+        return self.sign * self.entries[key][0]
+
+    def __setitem__(self, key: any, value: any) -> None:
+        self.pop(key)
+        self.order += 1
+        self.entries[key] = (self.sign * value, -self.order, key)
+        bisect.insort(self.container, self.entries[key])
+
+    def items(self) -> list:
+        return [(key, self.sign * value) for value, _, key in self.container]
+
+    def pop(self, key: any, default: any = None) -> any:
+        if key not in self.entries:
+            return default
+
+        entry = self.entries.pop(key)
+        del self.container[bisect.bisect_left(self.container, entry)]
+        return self.sign * entry[0]
+
+    def popitem(self) -> tuple[any, any]:
+        value, _, key = self.container.pop(0)
+        self.entries.pop(key)
+        return (key, self.sign * value)
+
+    def front(self) -> tuple[any, any]:
+        return self.items()[0]
+
+    def back(self) -> tuple[any, any]:
+        return self.items()[-1]
+
+    def rank(self, key: any) -> int:
+        return bisect.bisect_left(self.container, self.entries[key])
+
+class ReferencePriorityDict:
+    # heapq model of PriorityDict with lazy deletion of stale entries.
+    def __init__(self, _comparator: callable = SortedDictBase.min_comparator) -> None:
+        self.sign = 1 if _comparator is SortedDictBase.min_comparator else -1
+        self.entries = dict() # { k: [sign * v, order, k] }
+        self.heap = []
+        self.order = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __setitem__(self, key: any, value: any) -> None:
+        self.pop(key)
+        self.order += 1
+        self.entries[key] = [self.sign * value, self.order, key]
+        heapq.heappush(self.heap, self.entries[key])
+
+    def items(self) -> list:
+        return [(key, self.sign * value) for value, _, key in sorted(self.entries.values())]
+
+    def pop(self, key: any, default: any = None) -> any:
+        if key not in self.entries:
+            return default
+
+        entry = self.entries.pop(key)
+        entry[2] = None # Stale
+        return self.sign * entry[0]
+
+    def popitem(self) -> tuple[any, any]:
+        while True:
+            value, _, key = heapq.heappop(self.heap)
+
+            if key is not None:
+                self.entries.pop(key)
+                return (key, self.sign * value)
+
+def sorted_dict_updates(sorted_dict_type: type, size: int, seed: int = 0) -> callable:
+    # Returns a benchmark updating random keys of a full dictionary with random values.
+    random_state = random.Random(seed)
+    sorted_dict = sorted_dict_type()
+
+    for key in range(size):
+        sorted_dict[key] = random_state.random()
+
+    def benchmark() -> None:
+        sorted_dict[random_state.randrange(size)] = random_state.random()
+
+    return benchmark
+
+def sorted_dict_churn(sorted_dict_type: type, size: int, seed: int = 0) -> callable:
+    # Returns a benchmark popping the front and a random key, then reinserting both.
+    random_state = random.Random(seed)
+    sorted_dict = sorted_dict_type()
+
+    for key in range(size):
+        sorted_dict[key] = random_state.random()
+
+    def benchmark() -> None:
+        key, _ = sorted_dict.popitem()
+        _key = random_state.randrange(size)
+        sorted_dict.pop(_key)
+        sorted_dict[key] = random_state.random()
+        sorted_dict[_key] = random_state.random()
+
+    return benchmark
+
+DICT_TYPES = {
+    "SortedDict": SortedDict,
+    "dict+insort": ReferenceSortedDict,
+    "PriorityDict": PriorityDict,
+    "DaryPriorityDict": DaryPriorityDict,
+    "heapq": ReferencePriorityDict
+}
+
+BENCHMARKS = {
+    "update": sorted_dict_updates,
+    "churn": sorted_dict_churn
+}
+
+def run(sizes: list = SIZES, repeat: int = 3, seed: int = 0) -> dict:
+    # Returns the best time per call (s) by (size, dict type, benchmark).
+    timings = dict()
+
+    for size in sizes:
+        for dict_name, dict_type in DICT_TYPES.items():
+            for benchmark_name, benchmark in BENCHMARKS.items():
+                timer = timeit.Timer(benchmark(dict_type, size, seed))
+                number, _ = timer.autorange()
+                timings[(size, dict_name, benchmark_name)] = min(timer.repeat(repeat=repeat, number=number)) / number
+
+    return timings
+
+if __name__ == "__main__":
+    sizes = [int(float(arg)) for arg in sys.argv[1:]] or SIZES
+    print(f"{'size':>10}  {'dict':<24}" + "".join(f"{name:>14}" for name in BENCHMARKS))
+    timings = run(sizes)
+
+    for size in sizes:
+        for dict_name in DICT_TYPES:
+            row = [timings[(size, dict_name, name)] for name in BENCHMARKS]
+            print(f"{size:>10}  {dict_name:<24}" + "".join(f"{timing * 1e6:>12.2f}us" for timing in row))
@@ -0,0 +1,53 @@
+import random
+import sys
+import timeit
+from pyutils.sorted_dict.timing_wheel import TimingHeap, TimingWheel
+
+SIZES = [10 ** exponent for exponent in range(2, 6)]
+TICK = 0.01
+
+QUEUE_TYPES = {
+    "TimingWheel": TimingWheel,
+    "heapq": lambda tick, start_time: TimingHeap()
+}
+
+def repeating_tasks(queue_type: type, size: int, period: float = 10., seed: int = 0) -> callable:
+    """ Returns a benchmark advancing the clock by a tick and requeueing the expired repeating tasks,
+    with size tasks spread uniformly over the period, i.e. size * TICK / period tasks per call.
+    """
+    random_state = random.Random(seed)
+    periods = [period * random_state.uniform(.5, 1.5) for _ in range(size)]
+    queue = queue_type(TICK, start_time=0.)
+    clock = [0.]
+
+    for task, _period in enumerate(periods):
+        queue.push(task, random_state.uniform(0., _period))
+
+    def benchmark() -> None:
+        clock[0] += TICK
+
+        for task in list(queue.expire(clock[0])):
+            queue.push(task, clock[0] + periods[task])
+
+    return benchmark
+
+def run(sizes: list = SIZES, repeat: int = 3, seed: int = 0) -> dict:
+    # Returns the best time per requeued task (s) by (size, queue type).
+    timings = dict()
+
+    for size in sizes:
+        for queue_name, queue_type in QUEUE_TYPES.items():
+            timer = timeit.Timer(repeating_tasks(queue_type, size, seed=seed))
+            number, _ = timer.autorange()
+            tasks_per_call = size * TICK / 10.
+            timings[(size, queue_name)] = min(timer.repeat(repeat=repeat, number=number)) / number / tasks_per_call
+
+    return timings
+
+if __name__ == "__main__":
+    sizes = [int(float(arg)) for arg in sys.argv[1:]] or SIZES
+    print(f"{'tasks':>10}" + "".join(f"{name:>16}" for name in QUEUE_TYPES))
+    timings = run(sizes)
+
+    for size in sizes:
+        print(f"{size:>10}" + "".join(f"{timings[(size, name)] * 1e6:>14.2f}us" for name in QUEUE_TYPES))
@@ -30,7 +30,9 @@ setup(
         "selenium==4.2"
     ],
     ext_modules=cythonize(
-        make_cython_templates(os.path.join("src", "pyutils", "array_queue", "templates.json"))
+        make_cython_templates(os.path.join("src", "pyutils", "array_queue", "templates.json")) +
+        make_cython_templates(os.path.join("src", "pyutils", "sorted_dict", "templates.json")) +
+        [os.path.join("src", "pyutils", "sorted_dict", "comparator.pyx")]
     ),
     include_dirs=[
         np.get_include()
@@ -1,4 +1,37 @@
+import numpy as np
+
 from .array_queue import *
+from .multi_column_array_queue import *
+from .shared_array_queue import *
+from .array_queue import SPECIALIZATIONS
+
+# { dtype: [Name] } - e.g. ArrayQueue(dtype=np.float64, variant="Rolling") maps to RollingFloatArrayQueue
+ARRAY_QUEUE_NAMES = {
+    globals()[f"{config['[Name]']}ArrayQueue"].dtype: config["[Name]"] for config in SPECIALIZATIONS.values()
+}
+
+# Class name prefixes of the {variant}[Name]ArrayQueue specializations
+ARRAY_QUEUE_VARIANTS = ("", "Contiguous", "Rolling", "Mapped", "Growable", "MultiColumn", "Shared")
+
+def ArrayQueue(*args, dtype: any = np.float64, variant: str = "", **kwargs) -> any:
+    """ Constructs the {variant}[Name]ArrayQueue specialization for the dtype, where variant is one of
+    ARRAY_QUEUE_VARIANTS. E.g. ArrayQueue(1024, dtype=np.float32, variant="Rolling") returns
+    RollingFloat32ArrayQueue(1024), and ArrayQueue(1024, 3, variant="MultiColumn") returns
+    MultiColumnFloatArrayQueue(1024, 3).
+
+    Notes:
+    a. datetime64[ns] queues store nanoseconds as int64 - scalar getters and mutators use int64
+            values, while arrays are exposed as datetime64[ns].
+    """
+    dtype = np.dtype(dtype)
+
+    if variant not in ARRAY_QUEUE_VARIANTS:
+        raise ValueError(f"Unknown ArrayQueue variant {variant!r}, expected one of {ARRAY_QUEUE_VARIANTS}.")
+
+    if dtype not in ARRAY_QUEUE_NAMES:
+        raise TypeError(f"No ArrayQueue specialization for dtype {dtype}.")
+
+    return globals()[f"{variant}{ARRAY_QUEUE_NAMES[dtype]}ArrayQueue"](*args, **kwargs)
 
 if __name__ == "__main__":
     pass
\ No newline at end of file
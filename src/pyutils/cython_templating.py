@@ -1,11 +1,21 @@
 import json
 import os
 
-def make_cython_templates(template_json_fpath: str) -> list[str]:
+def make_cython_templates(template_json_fpath: str, dtype_matrix: dict = None) -> list[str]:
     """ Generates specialized cython modules based on templates and returns the
     source files (.pyx).
-    
-    todo documentation
+
+    Parameters:
+    :template_json_fpath (str): The json file mapping each module to its specializations,
+            where {module}.pxd_template and {module}.pyx_template are in the same directory.
+    :dtype_matrix (dict, opt): The mapping of dtype keys to placeholder replacements. Defaults
+            to the "dtypes" entry of the json file.
+
+    Notes:
+    a. A module maps either to {specialized_module: {placeholder: replacement}} or to a list of
+            dtype keys, which are specialized as {dtype}_{module} using the dtype_matrix.
+    b. The specializations are re-exported by a generated {module}.py, which also defines SPECIALIZATIONS
+            mapping each dtype key (or specialized module) to its placeholder replacements.
     """
     template_dpath = os.path.dirname(template_json_fpath)
 
@@ -19,6 +29,10 @@ def make_cython_templates(template_json_fpath: str) -> list[str]:
     with open(template_json_fpath) as json_file:
         templates = json.load(json_file)
 
+    if dtype_matrix is None:
+        dtype_matrix = templates.get("dtypes", dict())
+
+    templates.pop("dtypes", None)
     source_files = []
 
     for module_name in templates.keys():
@@ -32,8 +46,16 @@ def make_cython_templates(template_json_fpath: str) -> list[str]:
             pyx_template = pyx_file.read()
 
         module_py = ""
+        specializations = templates.get(module_name)
+
+        if isinstance(specializations, list):
+            specializations = {dtype: dtype_matrix[dtype] for dtype in specializations}
+            specialized_module_names = {dtype: f"{dtype}_{module_name}" for dtype in specializations}
+        else:
+            specialized_module_names = {key: key for key in specializations}
 
-        for specialized_module_name, config in templates.get(module_name).items():
+        for key, config in specializations.items():
+            specialized_module_name = specialized_module_names[key]
             specialized_pxd = pxd_template
             specialized_pyx = pyx_template
 
@@ -49,6 +71,7 @@ def make_cython_templates(template_json_fpath: str) -> list[str]:
 
             module_py += f"from .{specialized_module_name} import *\n"
 
+        module_py += f"\nSPECIALIZATIONS = {specializations!r}\n"
         module_py_fpath = os.path.join(template_dpath, f"{module_name}.py")
         write_file(module_py_fpath, module_py)
 
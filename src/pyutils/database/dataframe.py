@@ -2,6 +2,7 @@ import pandas as pd
 
 from pyutils.database.artifact import Artifact
 from pyutils.graph_dataframe import GraphDataFrameInterface
+from pyutils.graph_dataframe.partition_format import BasePartitionFormat, CsvPartitionFormat
 from pyutils.wrapper import WrappedFunction
 
 class DataFrame (Artifact):
@@ -24,11 +25,16 @@ class DataFrame (Artifact):
         return "DATAFRAME"
 
 class GraphDataFrame (DataFrame):
-    def save_data_to_path(self, artifact_data: any, path: str, partition_columns: list = list(), **kwargs) -> None:
-        GraphDataFrameInterface().save_dataframe(artifact_data, path, partition_columns)
+    def save_data_to_path(self, artifact_data: any, path: str, partition_columns: list = list(),
+        partition_format: BasePartitionFormat = CsvPartitionFormat(), **kwargs) -> None:
+        GraphDataFrameInterface().save_dataframe(artifact_data, path, partition_columns, partition_format)
 
-    def read_data_from_path(self, path: str, query_predicates: set = set(), **kwargs):
-        return GraphDataFrameInterface().read_dataframe(path, query_predicates)
+    def read_data_from_path(self, path: str, query_predicates: set = set(), max_workers: int = 1,
+        columns: list = None, **kwargs):
+        return GraphDataFrameInterface().read_dataframe(path, query_predicates, max_workers, columns=columns)
+
+    def iter_data(self, query_predicates: set = set(), chunksize: int = None, columns: list = None) -> pd.DataFrame:
+        return GraphDataFrameInterface().iter_dataframe(self.get_node_path(), query_predicates, chunksize, columns)
 
     def update_data(self, artifact_data: any, **kwargs) -> None:
         return GraphDataFrameInterface().merge_dataframe(artifact_data, self.get_node_path(),
@@ -4,9 +4,10 @@ from github import Repository
 from pyutils.database.dataframe import DataFrame, GraphDataFrame
 from pyutils.database.github_database.github_artifact import GitHubArtifact
 from pyutils.graph_dataframe import GraphDataFrameInterface, GraphDataFrameSchema
+from pyutils.graph_dataframe.partition_format import BasePartitionFormat, CsvPartitionFormat
 from pyutils.github_ops import file_path_exists, github_relative_path, has_authenticated
-from pyutils.github_ops.read_ops import read_csv_to_pandas, read_pickle
-from pyutils.github_ops.write_ops import delete_file, write_pandas_to_csv, write_pickle
+from pyutils.github_ops.read_ops import read_csv_to_pandas, read_file, read_pickle
+from pyutils.github_ops.write_ops import delete_file, write_files, write_pandas_to_csv, write_pickle
 
 class GitHubGraphDataFrameInterface (GraphDataFrameInterface):
     def __init__(self, repository: Repository, branch: str = "main", commit_message: str = '') -> None:
@@ -28,17 +29,24 @@ class GitHubGraphDataFrameInterface (GraphDataFrameInterface):
         write_pickle(graph_schema, self.repository, github_relative_path(file_path),
                 self.branch, self.commit_message)
 
-    def save_data_to_file_path(self, pdf: pd.DataFrame, file_path: str) -> None:
-        write_pandas_to_csv(pdf, self.repository, github_relative_path(file_path), self.branch,
-                self.commit_message, index=True)
+    def save_data_to_file_path(self, pdf: pd.DataFrame, file_path: str,
+        partition_format: BasePartitionFormat = CsvPartitionFormat()) -> None:
+        write_files(self.repository, [partition_format.to_content(pdf)], [github_relative_path(file_path)],
+                self.branch, self.commit_message)
 
     def read_schema_from_file_path(self, file_path: str) -> GraphDataFrameSchema:
         return read_pickle(self.repository, github_relative_path(file_path), self.branch,
                 use_github_api=has_authenticated(self.repository))
 
-    def read_data_from_file_path(self, file_path: str) -> pd.DataFrame:
-        return read_csv_to_pandas(self.repository, github_relative_path(file_path), self.branch,
-                use_github_api=has_authenticated(self.repository), index_col=0)
+    def read_data_from_file_path(self, file_path: str,
+        partition_format: BasePartitionFormat = CsvPartitionFormat(), columns: list = None) -> pd.DataFrame:
+        return partition_format.from_content(read_file(self.repository, github_relative_path(file_path), self.branch,
+                use_github_api=has_authenticated(self.repository)), columns)
+
+    def iter_data_from_file_path(self, file_path: str, partition_format: BasePartitionFormat = CsvPartitionFormat(),
+        columns: list = None, chunksize: int = None) -> pd.DataFrame:
+        return partition_format.iter_content(read_file(self.repository, github_relative_path(file_path), self.branch,
+                use_github_api=has_authenticated(self.repository)), columns, chunksize)
 
 class GitHubDataFrame (GitHubArtifact, DataFrame):
     def save_data_to_path(self, artifact_data: pd.DataFrame, path: str, commit_message: str = '',
@@ -56,16 +64,22 @@ class GitHubDataFrame (GitHubArtifact, DataFrame):
 
 class GitHubGraphDataFrame (GitHubArtifact, GraphDataFrame):
     def save_data_to_path(self, artifact_data: pd.DataFrame, path: str, partition_columns: list = list(),
-        commit_message: str = '', authenticated_repo: Repository = None, **kwargs) -> None:
+        commit_message: str = '', authenticated_repo: Repository = None,
+        partition_format: BasePartitionFormat = CsvPartitionFormat(), **kwargs) -> None:
         if not authenticated_repo:
             authenticated_repo = self.get_authenticated_repo()
 
         GitHubGraphDataFrameInterface(authenticated_repo, self.get_branch(), commit_message) \
-                .save_dataframe(artifact_data, path, partition_columns)
+                .save_dataframe(artifact_data, path, partition_columns, partition_format)
+
+    def read_data_from_path(self, path: str, query_predicates: set = set(), max_workers: int = 1,
+        columns: list = None, **kwargs) -> any:
+        return GitHubGraphDataFrameInterface(self.get_repository(), self.get_branch()) \
+                .read_dataframe(path, query_predicates, max_workers, columns=columns)
 
-    def read_data_from_path(self, path: str, query_predicates: set = set(), **kwargs) -> any:
+    def iter_data(self, query_predicates: set = set(), chunksize: int = None, columns: list = None) -> any:
         return GitHubGraphDataFrameInterface(self.get_repository(), self.get_branch()) \
-                .read_dataframe(path, query_predicates)
+                .iter_dataframe(self.get_node_path(), query_predicates, chunksize, columns)
 
     def update_data(self, artifact_data: any, commit_message: str = '', authenticated_repo: Repository = None, **kwargs) -> None:
         if not authenticated_repo:
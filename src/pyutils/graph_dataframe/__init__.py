@@ -5,6 +5,10 @@ import pickle
 import shutil
 import pandas as pd
 import pyutils.graph_dataframe.dtype_encoder as dtype_encoders
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from itertools import repeat
+from pyutils.graph_dataframe.partition_format import BasePartitionFormat, CsvPartitionFormat
 
 DTYPE_ENCODERS = {
     dtype_encoder() for _, dtype_encoder in inspect.getmembers(dtype_encoders, inspect.isclass)
@@ -62,10 +66,16 @@ class DtypeSchema:
         return pdf
 
 class GraphDataFrameSchema:
-    def __init__(self, dtype_schema: DtypeSchema, partition_columns: list = list()) -> None:
+    partition_format = CsvPartitionFormat() # Schemas saved before partition formats are CSV
+    partition_statistics = None # Schemas saved before partition statistics have none
+
+    def __init__(self, dtype_schema: DtypeSchema, partition_columns: list = list(),
+        partition_format: BasePartitionFormat = CsvPartitionFormat()) -> None:
         self.dtype_schema = dtype_schema
         self.partition_columns = partition_columns
+        self.partition_format = partition_format
         self.partition_paths = set()
+        self.partition_statistics = dict() # { partition_path: { "row_count": int, "columns": { column: dict } } }
 
     def get_partition_path(self, partition_column_values: tuple = tuple()) -> str:
         return os.path.join(*[
@@ -85,17 +95,48 @@ class GraphDataFrameSchema:
 
         return partition_column_values
 
+    def get_partition_statistics(self, partition_path: str) -> dict:
+        return None if self.partition_statistics is None else self.partition_statistics.get(partition_path)
+
+    def add_partition_statistics(self, partition_path: str, pdf: pd.DataFrame) -> None:
+        """ Records the row count of the decoded partition pdf and the min, max and null count of each column.
+        Min and max are omitted for columns whose values are all null or cannot be ordered.
+        """
+        if self.partition_statistics is None:
+            self.partition_statistics = dict()
+
+        column_statistics = dict()
+
+        for column in pdf.columns:
+            values = pdf[column].dropna()
+            column_statistics[column] = {"null_count": pdf.shape[0] - values.shape[0]}
+
+            try:
+                if values.shape[0]:
+                    column_statistics[column].update({"min": values.min(), "max": values.max()})
+            except TypeError:
+                pass # Unordered values
+
+        self.partition_statistics[partition_path] = {"row_count": pdf.shape[0], "columns": column_statistics}
+
+    def encode_dtype(self, pdf: pd.DataFrame) -> pd.DataFrame:
+        return pdf if self.partition_format.has_native_dtypes() else self.dtype_schema.encode_dtype(pdf)
+
+    def decode_dtype(self, pdf: pd.DataFrame) -> pd.DataFrame:
+        return pdf if self.partition_format.has_native_dtypes() else self.dtype_schema.decode_dtype(pdf)
+
 class GraphDataFrameInterface:
     @staticmethod
     def get_schema_file_path(root_file_path: str) -> str:
         return os.path.sep.join([root_file_path, "_schema.cp"])
     
     @staticmethod
-    def get_data_file_path(root_file_path: str, partition_path: str = None) -> str:
+    def get_data_file_path(root_file_path: str, partition_path: str = None,
+        partition_format: BasePartitionFormat = CsvPartitionFormat()) -> str:
         if not partition_path:
-            return os.path.join(root_file_path, "_data.csv")
+            return os.path.join(root_file_path, partition_format.FILE_NAME)
         
-        return os.path.join(root_file_path, partition_path, "_data.csv")
+        return os.path.join(root_file_path, partition_path, partition_format.FILE_NAME)
 
     @staticmethod
     def concat_drop_duplicates(pdf: pd.DataFrame, other: pd.DataFrame) -> pd.DataFrame:
@@ -107,11 +148,12 @@ class GraphDataFrameInterface:
     def remove_file_path(self, file_path: str) -> None:
         shutil.rmtree(file_path)
 
-    def save_data_to_file_path(self, pdf: pd.DataFrame, file_path: str) -> None:
+    def save_data_to_file_path(self, pdf: pd.DataFrame, file_path: str,
+        partition_format: BasePartitionFormat = CsvPartitionFormat()) -> None:
         if not self.file_path_exists(os.path.dirname(file_path)):
             os.makedirs(os.path.dirname(file_path))
         
-        pdf.to_csv(file_path, index=True)
+        partition_format.save_data(pdf, file_path)
 
     def save_schema_to_file_path(self, graph_schema: GraphDataFrameSchema, file_path: str) -> None:
         if not self.file_path_exists(os.path.dirname(file_path)):
@@ -120,18 +162,24 @@ class GraphDataFrameInterface:
         with open(file_path, "wb") as schema_file:
             cloudpickle.dump(graph_schema, schema_file, protocol=pickle.HIGHEST_PROTOCOL)
 
-    def read_data_from_file_path(self, file_path: str) -> pd.DataFrame:
-        return pd.read_csv(file_path, index_col=0)
+    def read_data_from_file_path(self, file_path: str,
+        partition_format: BasePartitionFormat = CsvPartitionFormat(), columns: list = None) -> pd.DataFrame:
+        return partition_format.read_data(file_path, columns)
+
+    def iter_data_from_file_path(self, file_path: str, partition_format: BasePartitionFormat = CsvPartitionFormat(),
+        columns: list = None, chunksize: int = None) -> pd.DataFrame:
+        return partition_format.iter_data(file_path, columns, chunksize)
 
     def read_schema_from_file_path(self, file_path: str) -> GraphDataFrameSchema:
         with open(file_path, "rb") as schema_file:
             return cloudpickle.load(schema_file)
 
-    def save_dataframe(self, pdf: pd.DataFrame, to_file_path: str, partition_columns: list = list()) -> None:
+    def save_dataframe(self, pdf: pd.DataFrame, to_file_path: str, partition_columns: list = list(),
+        partition_format: BasePartitionFormat = CsvPartitionFormat()) -> None:
         if self.file_path_exists(to_file_path):
             self.remove_file_path(to_file_path) # Remove existing dataframe graph
 
-        graph_schema = GraphDataFrameSchema(DtypeSchema(pdf), partition_columns)
+        graph_schema = GraphDataFrameSchema(DtypeSchema(pdf), partition_columns, partition_format)
 
         if partition_columns:
             for partition_column_values, partition_pdf in pdf.groupby(by=partition_columns):
@@ -139,15 +187,16 @@ class GraphDataFrameInterface:
                     partition_column_values = tuple([partition_column_values])
 
                 partition_path = graph_schema.get_partition_path(partition_column_values)
-                partition_file_path = self.get_data_file_path(to_file_path, partition_path)
-                encoded_partition_pdf = graph_schema.dtype_schema.encode_dtype(partition_pdf)
+                partition_file_path = self.get_data_file_path(to_file_path, partition_path, partition_format)
+                graph_schema.add_partition_statistics(partition_path, partition_pdf)
+                encoded_partition_pdf = graph_schema.encode_dtype(partition_pdf)
 
                 graph_schema.add_partition_path(partition_path)
-                self.save_data_to_file_path(encoded_partition_pdf, partition_file_path)
+                self.save_data_to_file_path(encoded_partition_pdf, partition_file_path, partition_format)
         else:
-            encoded_pdf = graph_schema.dtype_schema.encode_dtype(pdf)
-            dataframe_file_path = self.get_data_file_path(to_file_path)
-            self.save_data_to_file_path(encoded_pdf, dataframe_file_path)
+            encoded_pdf = graph_schema.encode_dtype(pdf)
+            dataframe_file_path = self.get_data_file_path(to_file_path, partition_format=partition_format)
+            self.save_data_to_file_path(encoded_pdf, dataframe_file_path, partition_format)
         
         schema_file_path = self.get_schema_file_path(to_file_path)
         self.save_schema_to_file_path(graph_schema, schema_file_path)
@@ -157,6 +206,7 @@ class GraphDataFrameInterface:
             return self.save_dataframe(pdf)
 
         graph_schema = self.read_schema_from_file_path(self.get_schema_file_path(to_file_path))
+        partition_format = graph_schema.partition_format
         
         if graph_schema.partition_columns:
             for partition_column_values, partition_pdf in pdf.groupby(by=graph_schema.partition_columns):
@@ -164,64 +214,191 @@ class GraphDataFrameInterface:
                     partition_column_values = tuple([partition_column_values])
 
                 partition_path = graph_schema.get_partition_path(partition_column_values)
-                partition_file_path = self.get_data_file_path(to_file_path, partition_path)
-                encoded_partition_pdf = graph_schema.dtype_schema.encode_dtype(partition_pdf)
+                partition_file_path = self.get_data_file_path(to_file_path, partition_path, partition_format)
+
+                if partition_path not in graph_schema.partition_paths:
+                    graph_schema.add_partition_statistics(partition_path, partition_pdf)
+
+                encoded_partition_pdf = graph_schema.encode_dtype(partition_pdf)
 
                 if partition_path in graph_schema.partition_paths:
                     encoded_partition_pdf = merge_function(
-                        self.read_data_from_file_path(partition_file_path),
+                        self.read_data_from_file_path(partition_file_path, partition_format),
                         encoded_partition_pdf
                     )
 
+                    graph_schema.add_partition_statistics(partition_path,
+                            graph_schema.decode_dtype(encoded_partition_pdf.copy()))
+
                 graph_schema.add_partition_path(partition_path)
-                self.save_data_to_file_path(encoded_partition_pdf, partition_file_path)
+                self.save_data_to_file_path(encoded_partition_pdf, partition_file_path, partition_format)
         else:
-            dataframe_file_path = self.get_data_file_path(to_file_path)
+            dataframe_file_path = self.get_data_file_path(to_file_path, partition_format=partition_format)
             encoded_pdf = merge_function(
-                self.read_data_from_file_path(dataframe_file_path),
-                graph_schema.dtype_schema.encode_dtype(pdf)
+                self.read_data_from_file_path(dataframe_file_path, partition_format),
+                graph_schema.encode_dtype(pdf)
             )
             
-            self.save_data_to_file_path(encoded_pdf, dataframe_file_path)
+            self.save_data_to_file_path(encoded_pdf, dataframe_file_path, partition_format)
         
         schema_file_path = self.get_schema_file_path(to_file_path)
         self.save_schema_to_file_path(graph_schema, schema_file_path)
 
-    def read_dataframe(self, from_file_path: str, query_predicates: set = set()) -> None:
-        graph_schema = self.read_schema_from_file_path(self.get_schema_file_path(from_file_path))
-
-        if not graph_schema.partition_columns:
-            dataframe_file_path = self.get_data_file_path(from_file_path)
-            return graph_schema.dtype_schema.decode_dtype(self.read_data_from_file_path(dataframe_file_path))
-        
-        partition_pdfs = list()
-
-        def query_partition(partition_path: str) -> None:
+    @staticmethod
+    def get_read_columns(query_predicates: set = set(), columns: list = None) -> set:
+        # Returns the columns to read for columns and the query predicates (all if None).
+        return None if columns is None else set(columns).union(
+            *[query_predicate.get_columns() for query_predicate in query_predicates])
+
+    def get_partition_paths(self, graph_schema: GraphDataFrameSchema, query_predicates: set = set()) -> list:
+        # Returns the sorted partition paths whose partition column values and statistics may satisfy the query predicates.
+        def query_partition(partition_path: str) -> bool:
             partition_column_values = graph_schema.get_partition_column_values(partition_path)
+            partition_statistics = graph_schema.get_partition_statistics(partition_path)
 
             for query_predicate in query_predicates:
                 if query_predicate.evaluate_column_values(partition_column_values) == False:
-                    return
+                    return False
+
+            if partition_statistics is None:
+                return True
 
-            partition_file_path = self.get_data_file_path(from_file_path, partition_path)
-            encoded_partition_pdf = self.read_data_from_file_path(partition_file_path)
-            decoded_partition_pdf = graph_schema.dtype_schema.decode_dtype(encoded_partition_pdf)
+            if not partition_statistics["row_count"]:
+                return False
 
             for query_predicate in query_predicates:
-                decoded_partition_pdf = query_predicate.query_dataframe(decoded_partition_pdf)
+                if query_predicate.evaluate_column_statistics(partition_statistics["columns"]) == False:
+                    return False
 
-            for column, column_value in partition_column_values.items():
-                decoded_partition_pdf[column] = column_value
+            return True
 
-            partition_pdfs.append(decoded_partition_pdf)
+        return [
+            partition_path for partition_path in sorted(graph_schema.partition_paths) if query_partition(partition_path)
+        ]
 
-        for partition_path in graph_schema.partition_paths:
-            query_partition(partition_path)
+    @staticmethod
+    def query_data(graph_schema: GraphDataFrameSchema, encoded_pdf: pd.DataFrame, query_predicates: set = set(),
+        columns: list = None, partition_column_values: dict = dict()) -> pd.DataFrame:
+        # Decodes and filters encoded data of the dataframe graph, projected onto columns (all if None).
+        decoded_pdf = graph_schema.decode_dtype(encoded_pdf)
+
+        for query_predicate in query_predicates:
+            decoded_pdf = query_predicate.query_dataframe(decoded_pdf)
+
+        for column, column_value in partition_column_values.items():
+            if columns is None or column in columns:
+                decoded_pdf[column] = column_value
+
+        return decoded_pdf if columns is None else decoded_pdf[list(columns)]
+
+    def read_partition(self, graph_schema: GraphDataFrameSchema, from_file_path: str, partition_path: str,
+        query_predicates: set = set(), columns: list = None) -> pd.DataFrame:
+        # Reads, decodes and filters a partition of the dataframe graph, projected onto columns (all if None).
+        partition_format = graph_schema.partition_format
+        partition_file_path = self.get_data_file_path(from_file_path, partition_path, partition_format)
+        encoded_partition_pdf = self.read_data_from_file_path(partition_file_path, partition_format,
+                self.get_read_columns(query_predicates, columns))
+
+        return self.query_data(graph_schema, encoded_partition_pdf, query_predicates, columns,
+                graph_schema.get_partition_column_values(partition_path))
+
+    def read_dataframe(self, from_file_path: str, query_predicates: set = set(), max_workers: int = 1,
+        use_multiprocessing: bool = False, columns: list = None) -> pd.DataFrame:
+        """ Reads the dataframe graph, skipping the partitions whose partition column values or column
+        statistics (zone maps) fail the query predicates.
+
+        Parameters:
+        :param (str) from_file_path: the root file path of the dataframe graph
+        :param (set, opt) query_predicates: the query predicates to filter the rows by
+        :param (int, opt) max_workers: the number of partitions to read, decode and filter concurrently
+        :param (bool, opt) use_multiprocessing: whether to read partitions in processes rather than threads,
+                if the interface reads from the local filesystem
+        :param (list, opt) columns: the columns to read (all if None), such that partition files are only
+                read and decoded for these and the query predicates' columns
+
+        Notes:
+        a. Partitions are concatenated in sorted partition path order regardless of max_workers.
+        b. Processes are sent read_partition_file and the partition file paths rather than the interface,
+                so interfaces reading files elsewhere (e.g. GitHub) use threads.
+        """
+        graph_schema = self.read_schema_from_file_path(self.get_schema_file_path(from_file_path))
+        partition_format = graph_schema.partition_format
+
+        if not graph_schema.partition_columns:
+            dataframe_file_path = self.get_data_file_path(from_file_path, partition_format=partition_format)
+            encoded_pdf = self.read_data_from_file_path(dataframe_file_path, partition_format,
+                    self.get_read_columns(query_predicates, columns))
+
+            return self.query_data(graph_schema, encoded_pdf, query_predicates, columns)
+        
+        partition_paths = self.get_partition_paths(graph_schema, query_predicates)
+        read_partition = partial(self.read_partition, graph_schema, from_file_path, query_predicates=query_predicates,
+                columns=columns)
+
+        if max_workers > 1 and len(partition_paths) > 1 and use_multiprocessing and \
+                type(self).read_data_from_file_path is GraphDataFrameInterface.read_data_from_file_path:
+            with ProcessPoolExecutor(min(max_workers, len(partition_paths))) as executor:
+                partition_pdfs = list(executor.map(read_partition_file, repeat(graph_schema),
+                        [self.get_data_file_path(from_file_path, partition_path, partition_format)
+                                for partition_path in partition_paths],
+                        repeat(query_predicates), repeat(columns),
+                        [graph_schema.get_partition_column_values(partition_path) for partition_path in partition_paths]
+                )) # In submission order
+        elif max_workers > 1 and len(partition_paths) > 1:
+            with ThreadPoolExecutor(min(max_workers, len(partition_paths))) as executor:
+                partition_pdfs = list(executor.map(read_partition, partition_paths)) # In submission order
+        else:
+            partition_pdfs = [read_partition(partition_path) for partition_path in partition_paths]
         
         if not partition_pdfs:
-            return pd.DataFrame([], columns=graph_schema.dtype_schema.dtype_encoder_schema.keys())
+            return pd.DataFrame([], columns=graph_schema.dtype_schema.dtype_encoder_schema.keys() if columns is None
+                    else columns)
         
         return pd.concat(partition_pdfs, axis=0)
 
+    def iter_dataframe(self, from_file_path: str, query_predicates: set = set(), chunksize: int = None,
+        columns: list = None) -> pd.DataFrame:
+        """ Yields the decoded and filtered dataframe graph in chunks, partition by partition in sorted
+        partition path order, such that only a chunk is held in memory at a time.
+
+        Parameters:
+        :param (str) from_file_path: the root file path of the dataframe graph
+        :param (set, opt) query_predicates: the query predicates to filter the rows by
+        :param (int, opt) chunksize: the number of rows to read at a time within a partition (whole
+                partitions if None), before filtering
+        :param (list, opt) columns: the columns to read (all if None)
+
+        Notes:
+        a. Empty chunks are skipped, so the chunks concatenate to read_dataframe's result.
+        """
+        graph_schema = self.read_schema_from_file_path(self.get_schema_file_path(from_file_path))
+        partition_format = graph_schema.partition_format
+        read_columns = self.get_read_columns(query_predicates, columns)
+
+        if not graph_schema.partition_columns:
+            data_file_paths = [(self.get_data_file_path(from_file_path, partition_format=partition_format), dict())]
+        else:
+            data_file_paths = [
+                (self.get_data_file_path(from_file_path, partition_path, partition_format),
+                        graph_schema.get_partition_column_values(partition_path))
+                for partition_path in self.get_partition_paths(graph_schema, query_predicates)
+            ]
+
+        for data_file_path, partition_column_values in data_file_paths:
+            for encoded_pdf in self.iter_data_from_file_path(data_file_path, partition_format, read_columns, chunksize):
+                pdf = self.query_data(graph_schema, encoded_pdf, query_predicates, columns, partition_column_values)
+
+                if pdf.shape[0]:
+                    yield pdf
+
+def read_partition_file(graph_schema: GraphDataFrameSchema, partition_file_path: str, query_predicates: set = set(),
+    columns: list = None, partition_column_values: dict = dict()) -> pd.DataFrame:
+    # Reads, decodes and filters a local partition file - picklable for processes, unlike the interfaces.
+    encoded_pdf = graph_schema.partition_format.read_data(partition_file_path,
+            GraphDataFrameInterface.get_read_columns(query_predicates, columns))
+
+    return GraphDataFrameInterface.query_data(graph_schema, encoded_pdf, query_predicates, columns,
+            partition_column_values)
+
 if __name__ == "__main__":
     pass
\ No newline at end of file
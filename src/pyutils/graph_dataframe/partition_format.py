@@ -0,0 +1,171 @@
+import io
+import pandas as pd
+
+class BasePartitionFormat:
+    """ Storage format of the partition data files of a graph dataframe.
+
+    Notes:
+    a. Formats with native dtypes store datetimes, periods etc. as is, so the dtype encoders are skipped.
+    b. Parquet and Feather require pyarrow.
+    """
+    FILE_NAME = "_data"
+
+    def has_native_dtypes(self) -> bool:
+        return False
+
+    def save_data(self, pdf: pd.DataFrame, file: any) -> None:
+        raise NotImplementedError()
+
+    def read_data(self, file: any, columns: list = None) -> pd.DataFrame:
+        # Reads the index and columns (all if None) of the data file.
+        raise NotImplementedError()
+
+    def iter_data(self, file: any, columns: list = None, chunksize: int = None) -> pd.DataFrame:
+        # Yields the data file in chunks of at most chunksize rows (whole if None).
+        pdf = self.read_data(file, columns)
+
+        if chunksize is None:
+            yield pdf
+            return
+
+        for pos in range(0, pdf.shape[0], chunksize):
+            yield pdf.iloc[pos:pos + chunksize]
+
+    def to_content(self, pdf: pd.DataFrame) -> any:
+        # Returns the file content of pdf in text or bytes.
+        content = io.BytesIO()
+        self.save_data(pdf, content)
+
+        return content.getvalue()
+
+    def from_content(self, content: any, columns: list = None) -> pd.DataFrame:
+        return self.read_data(io.BytesIO(content) if isinstance(content, bytes) else io.StringIO(content), columns)
+
+    def iter_content(self, content: any, columns: list = None, chunksize: int = None) -> pd.DataFrame:
+        return self.iter_data(io.BytesIO(content) if isinstance(content, bytes) else io.StringIO(content), columns,
+                chunksize)
+
+class CsvPartitionFormat (BasePartitionFormat):
+    FILE_NAME = "_data.csv"
+
+    def save_data(self, pdf: pd.DataFrame, file: any) -> None:
+        pdf.to_csv(file, index=True)
+
+    def read_data(self, file: any, columns: list = None) -> pd.DataFrame:
+        return pd.read_csv(file, index_col=0, usecols=self.get_usecols(file, columns))
+
+    def iter_data(self, file: any, columns: list = None, chunksize: int = None) -> pd.DataFrame:
+        if chunksize is None:
+            yield self.read_data(file, columns)
+            return
+
+        with pd.read_csv(file, index_col=0, usecols=self.get_usecols(file, columns), chunksize=chunksize) as reader:
+            yield from reader
+
+    def get_usecols(self, file: any, columns: list = None) -> list:
+        # Returns the positions of the index and columns (all if None) in the data file.
+        if columns is None:
+            return None
+
+        header = pd.read_csv(file, index_col=0, nrows=0).columns
+
+        if hasattr(file, "seek"):
+            file.seek(0)
+
+        return [0] + [pos + 1 for pos, column in enumerate(header) if column in columns] # Index first
+
+    def to_content(self, pdf: pd.DataFrame) -> str:
+        return pdf.to_csv(index=True)
+
+class ParquetPartitionFormat (BasePartitionFormat):
+    FILE_NAME = "_data.parquet"
+
+    def has_native_dtypes(self) -> bool:
+        return True
+
+    def save_data(self, pdf: pd.DataFrame, file: any) -> None:
+        pdf.to_parquet(file, index=True)
+
+    def read_data(self, file: any, columns: list = None) -> pd.DataFrame:
+        return pd.read_parquet(file, columns=columns)
+
+    def iter_data(self, file: any, columns: list = None, chunksize: int = None) -> pd.DataFrame:
+        if chunksize is None:
+            yield self.read_data(file, columns)
+            return
+
+        from pyarrow import parquet
+
+        parquet_file = parquet.ParquetFile(file)
+        index_columns = parquet_file.schema_arrow.pandas_metadata["index_columns"]
+        range_index = next((column for column in index_columns if isinstance(column, dict)), None)
+
+        if columns is not None:
+            columns = [column for column in index_columns if isinstance(column, str)] + \
+                    [column for column in parquet_file.schema_arrow.names if column in columns] # Index first
+
+        start = 0 if range_index is None else range_index["start"]
+
+        for record_batch in parquet_file.iter_batches(batch_size=chunksize, columns=columns):
+            pdf = record_batch.to_pandas()
+
+            if range_index is not None: # Stored as metadata rather than a column
+                stop = start + pdf.shape[0] * range_index["step"]
+                pdf.index = pd.RangeIndex(start, stop, range_index["step"], name=range_index["name"])
+                start = stop
+
+            yield pdf
+
+class FeatherPartitionFormat (BasePartitionFormat):
+    FILE_NAME = "_data.feather"
+    INDEX_COLUMN = "__index__" # Feather only stores default indices
+
+    def has_native_dtypes(self) -> bool:
+        return True
+
+    def save_data(self, pdf: pd.DataFrame, file: any) -> None:
+        pdf.rename_axis(pdf.index.name or self.INDEX_COLUMN).reset_index().to_feather(file)
+
+    def read_data(self, file: any, columns: list = None) -> pd.DataFrame:
+        if columns is not None:
+            from pyarrow import ipc
+
+            header = ipc.open_file(file).schema.names
+
+            if hasattr(file, "seek"):
+                file.seek(0)
+
+            columns = header[:1] + [column for column in header[1:] if column in columns] # Index first
+
+        return self.set_index(pd.read_feather(file, columns=columns))
+
+    def iter_data(self, file: any, columns: list = None, chunksize: int = None) -> pd.DataFrame:
+        if chunksize is None:
+            yield self.read_data(file, columns)
+            return
+
+        from pyarrow import ipc
+
+        with ipc.open_file(file) as reader:
+            header = reader.schema.names
+
+            if columns is not None:
+                columns = header[:1] + [column for column in header[1:] if column in columns] # Index first
+
+            for batch_index in range(reader.num_record_batches):
+                record_batch = reader.get_batch(batch_index)
+
+                if columns is not None:
+                    record_batch = record_batch.select(columns)
+
+                for pos in range(0, record_batch.num_rows, chunksize):
+                    yield self.set_index(record_batch.slice(pos, chunksize).to_pandas())
+
+    def set_index(self, pdf: pd.DataFrame) -> pd.DataFrame:
+        # Restores the index from the first column.
+        pdf = pdf.set_index(pdf.columns[0])
+
+        return pdf.rename_axis(None) if pdf.index.name == self.INDEX_COLUMN else pdf
+
+if __name__ == "__main__":
+    pass
\ No newline at end of file
@@ -1,8 +1,18 @@
 import pandas as pd
 
 class BaseQueryPredicate:
+    def get_columns(self) -> set:
+        # Returns the columns the predicate reads.
+        return set()
+
     def evaluate_column_values(self, column_values: dict) -> bool:
         return None
+
+    def evaluate_column_statistics(self, column_statistics: dict) -> bool:
+        """ Returns False if no row of a partition with the column statistics (min, max and null count by
+        column) can satisfy the predicate, otherwise None.
+        """
+        return None
     
     def evaluate_dataframe(self, pdf: pd.DataFrame) -> pd.DataFrame:
         return pd.Series([False] * pdf.shape[0])
@@ -15,11 +25,25 @@ class In (BaseQueryPredicate):
         self.column = column
         self.values = values
 
+    def get_columns(self) -> set:
+        return {self.column}
+
     def evaluate_column_values(self, column_values: dict) -> bool:
         if self.column in column_values:
             return column_values.get(self.column) in self.values
         
         return None
+
+    def evaluate_column_statistics(self, column_statistics: dict) -> bool:
+        statistics = column_statistics.get(self.column, dict())
+        if "min" not in statistics: return None
+
+        try:
+            if any(statistics["min"] <= value <= statistics["max"] for value in self.values): return None
+        except TypeError:
+            return None
+
+        return False if not statistics["null_count"] or not any(pd.isna(value) for value in self.values) else None
     
     def evaluate_dataframe(self, pdf: pd.DataFrame) -> pd.DataFrame:
         if not self.column in pdf.columns:
@@ -30,6 +54,9 @@ class In (BaseQueryPredicate):
 class Not (BaseQueryPredicate):
     def __init__(self, query: BaseQueryPredicate) -> None:
         self.query = query
+
+    def get_columns(self) -> set:
+        return self.query.get_columns()
     
     def evaluate_column_values(self, column_values: dict) -> bool:
         query_result = self.query.evaluate_column_values(column_values)
@@ -48,11 +75,23 @@ class GreaterThan (BaseQueryPredicate):
         self.column = column
         self.value = value
 
+    def get_columns(self) -> set:
+        return {self.column}
+
     def evaluate_column_values(self, column_values: dict) -> bool:
         if self.column in column_values:
             return column_values.get(self.column) > self.value
         
         return None
+
+    def evaluate_column_statistics(self, column_statistics: dict) -> bool:
+        statistics = column_statistics.get(self.column, dict())
+        if "max" not in statistics: return None
+
+        try:
+            return False if not statistics["max"] > self.value else None
+        except TypeError:
+            return None
     
     def evaluate_dataframe(self, pdf: pd.DataFrame) -> pd.DataFrame:
         if not self.column in pdf.columns:
@@ -65,11 +104,23 @@ class LesserThan (BaseQueryPredicate):
         self.column = column
         self.value = value
 
+    def get_columns(self) -> set:
+        return {self.column}
+
     def evaluate_column_values(self, column_values: dict) -> bool:
         if self.column in column_values:
             return column_values.get(self.column) < self.value
         
         return None
+
+    def evaluate_column_statistics(self, column_statistics: dict) -> bool:
+        statistics = column_statistics.get(self.column, dict())
+        if "min" not in statistics: return None
+
+        try:
+            return False if not statistics["min"] < self.value else None
+        except TypeError:
+            return None
     
     def evaluate_dataframe(self, pdf: pd.DataFrame) -> pd.DataFrame:
         if not self.column in pdf.columns:
@@ -1,7 +1,10 @@
+import copy
 from abc import ABC
 from abc import abstractmethod
 
 class SortedDictBase (ABC):
+    __slots__ = ("_comparator",)
+
     @staticmethod
     def max_comparator(base: any, other: any):
         # Descending
@@ -14,18 +17,21 @@ class SortedDictBase (ABC):
 
     def __init__(self, _comparator: callable = min_comparator) -> None:
         self._comparator = _comparator
-        self._kpos_map = dict() # { k: pos }
-        self._kv_container = [] # [(k, v) ...]
-    
+
+    @abstractmethod
+    def __len__(self) -> int:
+        raise NotImplementedError()
+
+    @abstractmethod
     def __contains__(self, key: any) -> bool:
-        return key in self._kpos_map
+        raise NotImplementedError()
 
     def __bool__(self) -> bool:
-        return len(self._kpos_map) > 0
+        return len(self) > 0
 
+    @abstractmethod
     def __getitem__(self, key: any) -> any:
-        pos = self._kpos_map[key]
-        return self._kv_container[pos][1]
+        raise NotImplementedError()
     
     @abstractmethod
     def __setitem__(self, key: any, value: any) -> None:
@@ -35,10 +41,6 @@ class SortedDictBase (ABC):
     def __iter__(self) -> any:
         raise NotImplementedError()
 
-    def _set_position(self, key: any, value: any, pos: int) -> None:
-        self._kpos_map[key] = pos
-        self._kv_container[pos] = (key, value)
-
     def keys(self) -> any:
         return self.__iter__()
 
@@ -66,90 +68,322 @@ class SortedDictBase (ABC):
     def back(self) -> tuple[any, any]:
         raise NotImplementedError()
 
+class CopyOnWriteMixin (ABC):
+    """ Copy-on-write copy() for sorted dictionaries, mixed in before SortedDictBase.
+    Subclasses declare a "_references" slot, implement _copy_storage() and call _own_storage() before mutating.
+
+    Notes:
+    a. Copies share their reference count without a lock, so a family of copies must not be mutated
+            or dropped from several threads at once.
+    """
+    __slots__ = ()
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._references = [1] # Number of copies sharing the storage
+
+    @abstractmethod
+    def _copy_storage(self) -> None:
+        # Replaces the storage containers by copies.
+        raise NotImplementedError()
+
+    def _own_storage(self) -> None:
+        # Called by mutators - copies the storage if shared with other copies.
+        if self._references[0] > 1:
+            self._references[0] -= 1
+            self._references = [1]
+            self._copy_storage()
+
     def copy(self):
-        _sorted_dict = type(self)(self._comparator)
-        _sorted_dict._kpos_map = self._kpos_map.copy()
-        _sorted_dict._kv_container = self._kv_container.copy()
+        """ Returns a copy-on-write snapshot in O(1).
+        The storage is shared until either copy is mutated, when the mutated copy takes its own copy.
+        """
+        _sorted_dict = copy.copy(self)
+        self._references[0] += 1
 
         return _sorted_dict
 
-class SortedDict (SortedDictBase):
-    # self._kv_container maintained in descending order
+    def __del__(self) -> None:
+        # Releases the shared storage, such that dropping an unmutated copy does not force a copy.
+        references = getattr(self, "_references", None)
+
+        if references is not None:
+            references[0] -= 1
+
+class SortedDict (CopyOnWriteMixin, SortedDictBase):
+    """ Dictionary ordered by value, stored as a list of sorted blocks (sortedcontainers-style).
+    Insert, update, delete and rank are O(log n) comparisons plus an O(block size) memmove.
+
+    Notes:
+    a. Iteration is front to back, i.e. ascending values for min_comparator and descending
+            values for max_comparator. Equal values are ordered by recency (last set first).
+    b. Entries are (value, order, key) tuples, shared between the key map and the blocks, where
+            order is a strictly increasing insertion counter that breaks ties.
+    c. A Fenwick tree over the block lengths resolves ranks in O(log n_blocks).
+    d. Entries stay tuples rather than parallel arrays - a tuple moves between blocks as one reference per
+            list.insert / pop, whereas parallel arrays would triple the memmoves. Int64SortedDict and
+            FloatSortedDict store the blocks as parallel typed arrays.
+    """
+    __slots__ = ("_references", "_entries", "_blocks", "_index", "_order")
+    _BLOCK_SIZE = 512 # Blocks split above twice and merge below half the block size
+
+    def __init__(self, _comparator: callable = SortedDictBase.min_comparator) -> None:
+        super().__init__(_comparator)
+        self._entries = dict() # { k: (v, order, k) }
+        self._blocks = [] # [[(v, order, k) ...] ...] front to back
+        self._index = [0] # Fenwick tree over len(block)
+        self._order = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: any) -> bool:
+        return key in self._entries
+
+    def __getitem__(self, key: any) -> any:
+        return self._entries[key][0]
+
     def __setitem__(self, key: any, value: any) -> None:
-        if key in self:
-            pos = self._kpos_map[key]
-            self._kv_container[pos] = (key, value)
-            pos = self._bubble_down(pos)
-            self._bubble_up(pos)
-            return
-
-        pos = len(self._kv_container)
-        self._kv_container.append((key, value))
-        self._kpos_map[key] = pos
-        self._bubble_up(pos)
-        
+        self._own_storage()
+
+        if key in self._entries:
+            self._remove(self._entries[key])
+
+        self._order += 1
+        entry = (value, self._order, key)
+        self._entries[key] = entry
+        self._insert(entry)
+
     def __iter__(self) -> any:
-        pos = len(self._kv_container) - 1
-        
-        while pos >= 0:
-            yield self._kv_container[pos][0]
-            pos -= 1
-
-    def _bubble_up(self, pos: int) -> int:
-        key, value = self._kv_container[pos]
-
-        while pos > 0:
-            _key, _value = self._kv_container[pos - 1]
-
-            if not self._comparator(_value, value):
-                break
-            
-            self._set_position(_key, _value, pos)
-            pos -= 1
-
-        self._set_position(key, value, pos)
-        return pos
-        
-    def _bubble_down(self, pos: int) -> int:
-        key, value = self._kv_container[pos]
-        max_pos = len(self._kv_container) - 1
-
-        while pos < max_pos:
-            _key, _value = self._kv_container[pos + 1]
-
-            if not self._comparator(value, _value):
-                break
-            
-            self._set_position(_key, _value, pos)
-            pos += 1
-
-        self._set_position(key, value, pos)
-        return pos
+        for block in self._blocks:
+            for entry in block:
+                yield entry[2]
+
+    def values(self) -> any:
+        for block in self._blocks:
+            for entry in block:
+                yield entry[0]
+
+    def items(self) -> tuple[any, any]:
+        for block in self._blocks:
+            for entry in block:
+                yield (entry[2], entry[0])
+
+    def _precedes(self, entry: tuple, other: tuple) -> bool:
+        if self._comparator(entry[0], other[0]):
+            return True
+
+        if self._comparator(other[0], entry[0]):
+            return False
+
+        return entry[1] > other[1] # Most recent first
+
+    def _bisect(self, block: list, entry: tuple) -> int:
+        # Returns the position of the first entry in block not preceding entry.
+        lo, hi = 0, len(block)
+
+        while lo < hi:
+            mid = (lo + hi) >> 1
+
+            if self._precedes(block[mid], entry):
+                lo = mid + 1
+            else:
+                hi = mid
+
+        return lo
+
+    def _locate(self, entry: tuple) -> int:
+        # Returns the index of the first block whose last entry does not precede entry (or the last block).
+        lo, hi = 0, len(self._blocks) - 1
+
+        while lo < hi:
+            mid = (lo + hi) >> 1
+
+            if self._precedes(self._blocks[mid][-1], entry):
+                lo = mid + 1
+            else:
+                hi = mid
+
+        return lo
+
+    def _bisect_value(self, value: any, right: bool = False) -> tuple[int, int]:
+        # Returns the (block_pos, pos) of the first entry whose value does not precede value,
+        # or with right, of the first entry whose value succeeds value.
+        def precedes(entry: tuple) -> bool:
+            return not self._comparator(value, entry[0]) if right else self._comparator(entry[0], value)
+
+        if not self._blocks:
+            return (0, 0)
+
+        lo, hi = 0, len(self._blocks) - 1
+
+        while lo < hi:
+            mid = (lo + hi) >> 1
+
+            if precedes(self._blocks[mid][-1]):
+                lo = mid + 1
+            else:
+                hi = mid
+
+        block = self._blocks[lo]
+        block_pos, lo, hi = lo, 0, len(block)
+
+        while lo < hi:
+            mid = (lo + hi) >> 1
+
+            if precedes(block[mid]):
+                lo = mid + 1
+            else:
+                hi = mid
+
+        return (block_pos, lo)
+
+    def _rebuild_index(self) -> None:
+        index = [0]
+        index.extend(len(block) for block in self._blocks)
+
+        for pos in range(1, len(index)):
+            parent_pos = pos + (pos & -pos)
+
+            if parent_pos < len(index):
+                index[parent_pos] += index[pos]
+
+        self._index = index
+
+    def _update_index(self, block_pos: int, delta: int) -> None:
+        pos = block_pos + 1
+
+        while pos < len(self._index):
+            self._index[pos] += delta
+            pos += pos & -pos
+
+    def _count_before(self, block_pos: int) -> int:
+        # Returns the number of entries in self._blocks[:block_pos].
+        count = 0
+
+        while block_pos > 0:
+            count += self._index[block_pos]
+            block_pos -= block_pos & -block_pos
+
+        return count
+
+    def _insert(self, entry: tuple) -> None:
+        if not self._blocks:
+            self._blocks.append([entry])
+            return self._rebuild_index()
+
+        block_pos = self._locate(entry)
+        block = self._blocks[block_pos]
+        block.insert(self._bisect(block, entry), entry)
+
+        if len(block) > 2 * self._BLOCK_SIZE:
+            self._blocks[block_pos:block_pos + 1] = [block[:self._BLOCK_SIZE], block[self._BLOCK_SIZE:]]
+            return self._rebuild_index()
+
+        self._update_index(block_pos, 1)
+
+    def _remove(self, entry: tuple) -> None:
+        block_pos = self._locate(entry)
+        pos = self._bisect(self._blocks[block_pos], entry)
+        assert self._blocks[block_pos][pos] is entry
+        self._remove_at(block_pos, pos)
+
+    def _remove_at(self, block_pos: int, pos: int) -> None:
+        block = self._blocks[block_pos]
+        del block[pos]
+
+        if not block:
+            del self._blocks[block_pos]
+            return self._rebuild_index()
+
+        if len(block) < self._BLOCK_SIZE >> 1 and len(self._blocks) > 1:
+            # Merge with a neighbour and split again if oversized
+            block_pos = block_pos - 1 if block_pos else block_pos
+            block = self._blocks[block_pos] + self._blocks[block_pos + 1]
+            blocks = [block] if len(block) <= 2 * self._BLOCK_SIZE else \
+                [block[:len(block) >> 1], block[len(block) >> 1:]]
+            self._blocks[block_pos:block_pos + 2] = blocks
+            return self._rebuild_index()
+
+        self._update_index(block_pos, -1)
+
+    def rank(self, key: any) -> int:
+        # Returns the position of key in front to back order.
+        entry = self._entries[key]
+        block_pos = self._locate(entry)
+
+        return self._count_before(block_pos) + self._bisect(self._blocks[block_pos], entry)
+
+    def bisect_value(self, value: any) -> int:
+        # Returns the number of entries whose value precedes value (the rank of the first_at_least entry).
+        block_pos, pos = self._bisect_value(value)
+        return self._count_before(block_pos) + pos
+
+    def first_at_least(self, value: any) -> (tuple[any, any] | None):
+        """ Returns the front most (key, value) whose value does not precede value, i.e. the smallest
+        value >= value for min_comparator and the largest value <= value for max_comparator,
+        otherwise returns None.
+        """
+        block_pos, pos = self._bisect_value(value)
+
+        if block_pos < len(self._blocks) and pos < len(self._blocks[block_pos]):
+            _value, _, key = self._blocks[block_pos][pos]
+            return (key, _value)
+
+        return None
+
+    def irange(self, min_value: any = None, max_value: any = None) -> tuple[any, any]:
+        """ Yields the (key, value) items front to back from the first value not preceding min_value
+        up to the last value not succeeding max_value (inclusive). None bounds are open.
+        """
+        block_pos, pos = (0, 0) if min_value is None else self._bisect_value(min_value)
+
+        while block_pos < len(self._blocks):
+            for value, _, key in self._blocks[block_pos][pos:]:
+                if max_value is not None and self._comparator(max_value, value):
+                    return
+
+                yield (key, value)
+
+            block_pos, pos = block_pos + 1, 0
+
+    def count_between(self, min_value: any, max_value: any) -> int:
+        # Returns the number of entries with values between min_value and max_value (inclusive) in O(log n).
+        block_pos, pos = self._bisect_value(max_value, right=True)
+        count = self._count_before(block_pos) + pos - self.bisect_value(min_value)
+
+        return max(count, 0)
 
     def popitem(self) -> tuple[any, any]:
-        key, value = self._kv_container.pop()
-        self._kpos_map.pop(key)
+        value, _, key = self._blocks[0][0]
+        self._own_storage()
+        self._entries.pop(key)
+        self._remove_at(0, 0)
 
         return (key, value)
 
     def pop(self, key: any, default: any = None) -> any:
-        if key not in self:
+        if key not in self._entries:
             return default
 
-        pos = self._kpos_map[key]
-        _pos = pos
-
-        for key, _ in self._kv_container[pos + 1:]:
-            self._kpos_map[key] = _pos
-            _pos += 1
+        self._own_storage()
+        entry = self._entries.pop(key)
+        self._remove(entry)
 
-        return self._kv_container.pop(pos)[1]
+        return entry[0]
 
     def front(self) -> tuple[any, any]:
-        return self._kv_container[-1]
+        value, _, key = self._blocks[0][0]
+        return (key, value)
     
     def back(self) -> tuple[any, any]:
-        return self._kv_container[0]
+        value, _, key = self._blocks[-1][-1]
+        return (key, value)
+
+    def _copy_storage(self) -> None:
+        self._entries = self._entries.copy()
+        self._blocks = [block.copy() for block in self._blocks]
+        self._index = self._index.copy()
 
 if __name__ == "__main__":
     pass
\ No newline at end of file
@@ -0,0 +1,3 @@
+cpdef enum Comparator:
+    MIN = 0 # Ascending, i.e. SortedDictBase.min_comparator
+    MAX = 1 # Descending, i.e. SortedDictBase.max_comparator
@@ -0,0 +1,11 @@
+from . import SortedDictBase
+
+def as_comparator(comparator: object) -> Comparator:
+    # Maps SortedDictBase.min_comparator / max_comparator (or a Comparator) to a Comparator.
+    if comparator is SortedDictBase.min_comparator:
+        return Comparator.MIN
+
+    if comparator is SortedDictBase.max_comparator:
+        return Comparator.MAX
+
+    return Comparator(comparator)
@@ -0,0 +1,332 @@
+import multiprocessing
+import threading
+import numpy as np
+from itertools import islice
+from multiprocessing.shared_memory import SharedMemory
+from . import SortedDictBase
+from .priority_dict import DaryHeapBase, DaryPriorityDict
+
+class ConcurrentPriorityDict (SortedDictBase):
+    """ Thread-safe priority dictionary, such that producer threads can push while consumers pop.
+    Each operation holds a lock around a DaryPriorityDict for a single O(log n) critical section,
+    and popitem(block=True) waits for producers instead of polling.
+
+    Parameters:
+    :param (callable, opt) _comparator: the priority comparator, e.g. SortedDictBase.min_comparator
+    :param (int, opt) arity: the arity of the underlying heap
+
+    Notes:
+    a. Iteration walks an eager snapshot copied under the lock, so producers are only blocked for the
+            O(n) copy rather than the iteration, and no copy-on-write state is shared across threads.
+    b. The GIL already serializes the heap operations, hence a lock per operation rather than
+            lock striping or a lock-free heap, which would only add contention and overhead.
+    """
+    __slots__ = ("_priority_dict", "_condition")
+
+    def __init__(self, _comparator: callable = SortedDictBase.min_comparator, arity: int = 4) -> None:
+        super().__init__(_comparator)
+        self._priority_dict = DaryPriorityDict(_comparator, arity)
+        self._condition = threading.Condition(threading.Lock())
+
+    def __len__(self) -> int:
+        return len(self._priority_dict)
+
+    def __contains__(self, key: any) -> bool:
+        with self._condition:
+            return key in self._priority_dict
+
+    def __getitem__(self, key: any) -> any:
+        with self._condition:
+            return self._priority_dict[key]
+
+    def __setitem__(self, key: any, value: any) -> None:
+        with self._condition:
+            self._priority_dict[key] = value
+            self._condition.notify()
+
+    def __iter__(self) -> any:
+        return self.snapshot().__iter__()
+
+    def items(self) -> tuple[any, any]:
+        return self.snapshot().items()
+
+    def values(self) -> any:
+        return self.snapshot().values()
+
+    def snapshot(self) -> DaryPriorityDict:
+        # Returns a copy of the underlying priority dictionary that owns its storage.
+        with self._condition:
+            _priority_dict = self._priority_dict.copy()
+            _priority_dict._own_storage() # Copies now, under the lock
+
+            return _priority_dict
+
+    def update(self, items: any) -> None:
+        # Sets a mapping or iterable of (key, value) pairs atomically.
+        with self._condition:
+            self._priority_dict.update(items)
+            self._condition.notify_all()
+
+    def merge(self, other: SortedDictBase) -> None:
+        self.update(other.items())
+
+    def setdefault(self, key: any, value: any) -> any:
+        # Inserts key with value if absent and returns its value atomically.
+        with self._condition:
+            if key not in self._priority_dict:
+                self._priority_dict[key] = value
+                self._condition.notify()
+
+            return self._priority_dict[key]
+
+    def popitem(self, block: bool = False, timeout: float = None) -> tuple[any, any]:
+        """ Pops the front (key, value), waiting up to timeout seconds (forever if None) for an item
+        when block is set. Raises IndexError if empty.
+        """
+        with self._condition:
+            if block and not self._condition.wait_for(self._priority_dict.__len__, timeout):
+                raise IndexError("popitem from an empty priority dict")
+
+            return self._priority_dict.popitem()
+
+    def popitems(self, n: int) -> list[tuple[any, any]]:
+        # Pops at most n front (key, value) items in priority order under a single lock acquisition.
+        with self._condition:
+            return [self._priority_dict.popitem() for _ in range(min(n, len(self._priority_dict)))]
+
+    def pop(self, key: any, default: any = None) -> any:
+        with self._condition:
+            return self._priority_dict.pop(key, default)
+
+    def front(self) -> tuple[any, any]:
+        with self._condition:
+            return self._priority_dict.front()
+
+    def back(self) -> tuple[any, any]:
+        with self._condition:
+            return self._priority_dict.back()
+
+    def nsmallest(self, k: int) -> list[tuple[any, any]]:
+        return list(islice(self.items(), k))
+
+    def copy(self):
+        _priority_dict = type(self)(self._comparator, self._priority_dict._arity)
+        _priority_dict._priority_dict = self.snapshot()
+
+        return _priority_dict
+
+# Header slots (int64)
+CAPACITY_SLOT = 0
+SIZE_SLOT = 1
+HEADER_BYTES = 64
+
+class SharedPriorityDict (DaryHeapBase):
+    """ Process-shared priority dictionary over multiprocessing.shared_memory with integer keys in
+    [0, key_capacity) and float64 values. The heap, positions and values arrays live in shared memory
+    and every operation holds a multiprocessing.Lock, such that producer processes can push directly.
+
+    Parameters:
+    :param (int) key_capacity: the number of keys, i.e. keys are 0 ... key_capacity - 1
+    :param (callable, opt) _comparator: the priority comparator, e.g. SortedDictBase.min_comparator
+    :param (int, opt) arity: the arity of the heap
+    :param (str, opt) name: the name of an existing shared priority dictionary to attach to
+    :param (multiprocessing.Lock, opt) lock: the lock of the shared priority dictionary to attach to,
+            or the lock to create it with, e.g. from the spawn context of the processes
+
+    Notes:
+    a. Pass the dictionary to child processes as a Process argument (or by inheritance) - it is
+            pickled by name together with its lock, which multiprocessing only allows when spawning.
+    b. The creating process owns the shared memory and should unlink() it once all processes have
+            close()d their handles.
+    """
+    __slots__ = ("_shared_memory", "_header", "_lock", "_owner")
+
+    def __init__(self, key_capacity: int, _comparator: callable = SortedDictBase.min_comparator, arity: int = 4,
+            name: str = None, lock: any = None) -> None:
+        super().__init__(_comparator, arity)
+
+        if name is None:
+            self._shared_memory = SharedMemory(create=True, size=HEADER_BYTES + 24 * key_capacity)
+            self._lock = multiprocessing.Lock() if lock is None else lock
+            self._owner = True
+        else:
+            assert lock is not None
+            self._shared_memory = SharedMemory(name=name)
+            self._lock = lock
+            self._owner = False
+
+        buffer = self._shared_memory.buf
+        self._header = buffer[:HEADER_BYTES].cast("q")
+        self._heap = buffer[HEADER_BYTES:HEADER_BYTES + 8 * key_capacity].cast("q") # [key ...]
+        self._positions = buffer[HEADER_BYTES + 8 * key_capacity:HEADER_BYTES + 16 * key_capacity].cast("q")
+        self._values = buffer[HEADER_BYTES + 16 * key_capacity:HEADER_BYTES + 24 * key_capacity].cast("d")
+        self._keys = range(key_capacity) # Keys are their own handles
+
+        if self._owner:
+            self._header[CAPACITY_SLOT] = key_capacity
+            self._header[SIZE_SLOT] = 0
+
+            for key in range(key_capacity):
+                self._positions[key] = -1 # Absent
+
+        assert self._header[CAPACITY_SLOT] == key_capacity
+
+    @classmethod
+    def from_items(cls, items: any, key_capacity: int, _comparator: callable = SortedDictBase.min_comparator,
+            *args, **kwargs):
+        # Constructs a shared priority dictionary with key_capacity keys from a mapping or iterable of (key, value) pairs.
+        _priority_dict = cls(key_capacity, _comparator, *args, **kwargs)
+        _priority_dict.update(items)
+
+        return _priority_dict
+
+    # Getters
+    def get_name(self) -> str:
+        return self._shared_memory.name
+
+    def get_lock(self) -> any:
+        return self._lock
+
+    def __len__(self) -> int:
+        return self._header[SIZE_SLOT]
+
+    def __contains__(self, key: any) -> bool:
+        return 0 <= key < len(self._keys) and self._positions[key] >= 0
+
+    def __getitem__(self, key: int) -> float:
+        with self._lock:
+            if not key in self:
+                raise KeyError(key)
+
+            return self._values[key]
+
+    def items(self) -> tuple[int, float]:
+        # Priority order of a snapshot taken under the lock.
+        return self.snapshot().items()
+
+    def front(self) -> tuple[int, float]:
+        with self._lock:
+            if not len(self):
+                raise IndexError("front from an empty priority dict")
+
+            key = self._heap[0]
+            return (key, self._values[key])
+
+    def back(self) -> tuple[int, float]:
+        with self._lock:
+            key = self._heap[self._back_position()]
+            return (key, self._values[key])
+
+    def get_values_array(self) -> np.ndarray:
+        # Returns the values in heap order as a NumPy array.
+        with self._lock:
+            return np.asarray(self._values)[np.asarray(self._heap)[:len(self)]]
+
+    def _heap_items(self) -> tuple[int, float]:
+        return self.snapshot()._heap_items()
+
+    def snapshot(self) -> DaryPriorityDict:
+        # Returns a process-local DaryPriorityDict copy.
+        with self._lock:
+            return DaryPriorityDict.from_items(
+                ((key, self._values[key]) for key in self._heap[:len(self)]), self._comparator, self._arity)
+
+    # Mutators
+    def __setitem__(self, key: int, value: float) -> None:
+        assert 0 <= key < len(self._keys)
+
+        with self._lock:
+            self._set(key, value)
+
+    def _set(self, key: int, value: float) -> None:
+        value = float(value)
+        pos = self._positions[key]
+
+        if pos < 0:
+            pos = len(self)
+            self._values[key] = value
+            self._heap[pos] = key
+            self._positions[key] = pos
+            self._header[SIZE_SLOT] = pos + 1
+            return self._sift_down(0, pos)
+
+        prev_value = self._values[key]
+        self._values[key] = value
+
+        if self._comparator(value, prev_value):
+            self._sift_down(0, pos)
+        else:
+            self._sift_up(pos)
+
+    def _remove_at(self, pos: int) -> None:
+        key = self._heap[pos]
+        end_pos = len(self) - 1
+        end_key = self._heap[end_pos]
+        self._header[SIZE_SLOT] = end_pos
+        self._positions[key] = -1
+
+        if end_key != key:
+            self._heap[pos] = end_key
+            self._positions[end_key] = pos
+            self._sift_up(pos)
+            self._sift_down(0, self._positions[end_key])
+
+    def update(self, items: any) -> None:
+        # Sets a mapping or iterable of (key, value) pairs atomically.
+        items = list(items.items() if hasattr(items, "items") else items)
+
+        with self._lock:
+            for key, value in items:
+                assert 0 <= key < len(self._keys)
+                self._set(key, value)
+
+    def popitem(self) -> tuple[int, float]:
+        with self._lock:
+            if not len(self):
+                raise IndexError("popitem from an empty priority dict")
+
+            key = self._heap[0]
+            value = self._values[key]
+            self._remove_at(0)
+
+            return (key, value)
+
+    def pop(self, key: int, default: any = None) -> any:
+        with self._lock:
+            if key not in self:
+                return default
+
+            value = self._values[key]
+            self._remove_at(self._positions[key])
+
+            return value
+
+    def copy(self) -> DaryPriorityDict:
+        return self.snapshot()
+
+    def close(self) -> None:
+        # Releases this process' handle.
+        if self._shared_memory is None:
+            return
+
+        for view in (self._header, self._heap, self._positions, self._values):
+            view.release()
+
+        self._shared_memory.close()
+        self._shared_memory = None
+
+    def __del__(self) -> None:
+        if getattr(self, "_shared_memory", None) is not None:
+            self.close()
+
+    def unlink(self) -> None:
+        assert self._owner
+        shared_memory = self._shared_memory
+        self.close()
+        shared_memory.unlink()
+
+    def __reduce__(self):
+        return (self.__class__, (len(self._keys), self._comparator, self._arity, self.get_name(), self._lock))
+
+if __name__ == "__main__":
+    pass
\ No newline at end of file
@@ -1,103 +1,330 @@
-from sorted_dict import SortedDictBase
+import numpy as np
+from array import array, typecodes
+from itertools import islice
+from . import CopyOnWriteMixin, SortedDictBase
 
-class PriorityDict (SortedDictBase):   
-    def __setitem__(self, key: any, value: any) -> None:
-        if not key in self:
-            pos = len(self._kv_container)
-            self._kpos_map[key] = pos
-            self._kv_container.append((key, value))
-            return self._sift_down(0, pos)
-        
-        pos = self._kpos_map[key]
-        prev_value = self._kv_container[pos][1]
-        self._kv_container[pos] = (key, value) # No change in position
-
-        if self._comparator(prev_value, value):
-            self._sift_down(0, pos)
-        else:
-            self._sift_up(pos)
+class DaryHeapBase (SortedDictBase):
+    """ Indexed d-ary heap over integer handles - the sift, ordered iteration and back() algorithms shared by
+    DaryPriorityDict and SharedPriorityDict. Subclasses assign the storage: _keys and _values by handle,
+    _positions (the heap position by handle) and _heap (the handles in heap order).
+    """
+    __slots__ = ("_arity", "_keys", "_values", "_positions", "_heap")
+
+    def __init__(self, _comparator: callable = SortedDictBase.min_comparator, arity: int = 4) -> None:
+        assert arity >= 2
+        super().__init__(_comparator)
+        self._arity = arity
+
+    def __len__(self) -> int:
+        return len(self._heap)
 
     def __iter__(self) -> any:
-        raise NotImplementedError()
+        for key, _ in self.items():
+            yield key
+
+    def values(self) -> any:
+        for _, value in self.items():
+            yield value
+
+    def items(self) -> tuple[any, any]:
+        # Priority order without mutating the heap - the heap must not be modified while iterating.
+        for pos in self._iter_positions():
+            handle = self._heap[pos]
+            yield (self._keys[handle], self._values[handle])
+
+    def _value_at(self, pos: int) -> any:
+        return self._values[self._heap[pos]]
+
+    def _iter_positions(self) -> any:
+        """ Yields the heap positions in priority order by a lazy frontier walk.
+        The frontier holds the children of yielded positions in a binary heap, such that the first k
+        positions cost O(k log k) without copying or popping the heap.
+        """
+        if not len(self):
+            return
+
+        frontier = DaryPriorityDict(self._comparator, 2) # { pos: value }
+        frontier[0] = self._value_at(0)
+
+        while frontier:
+            pos, _ = frontier.popitem()
+            yield pos
+
+            child_pos = self._arity * pos + 1
+
+            for _child_pos in range(child_pos, min(child_pos + self._arity, len(self))):
+                frontier[_child_pos] = self._value_at(_child_pos)
+
+    def _back_position(self) -> int:
+        # Returns the heap position of the last entry in priority order by scanning the leaves in O(n).
+        end_pos = len(self)
+
+        if not end_pos:
+            raise IndexError("back from an empty priority dict")
+
+        back_pos = (end_pos - 2) // self._arity + 1 # First leaf
+        back_value = self._value_at(back_pos)
+
+        for pos in range(back_pos + 1, end_pos):
+            value = self._value_at(pos)
+
+            if self._comparator(back_value, value):
+                back_pos, back_value = pos, value
+
+        return back_pos
+
+    def _heap_items(self) -> tuple[any, any]:
+        # Heap order
+        for handle in self._heap:
+            yield (self._keys[handle], self._values[handle])
+
+    def _heapify(self) -> None:
+        for pos in reversed(range((len(self) - 2) // self._arity + 1)):
+            self._sift_up(pos)
 
     def _sift_down(self, start_pos: int, pos: int) -> None:
-        key, value = self._kv_container[pos]
+        # Moves the entry at pos towards the root (heapq naming).
+        heap, values, positions, comparator = self._heap, self._values, self._positions, self._comparator
+        handle = heap[pos]
+        value = values[handle]
 
         while pos > start_pos:
-            parent_pos = (pos - 1) >> 1
-            parent_key, parent_value = self._kv_container[parent_pos]
+            parent_pos = (pos - 1) // self._arity
+            parent_handle = heap[parent_pos]
 
-            if self._comparator(value, parent_value):
-                self._set_position(parent_key, parent_value, pos)
-                pos = parent_pos
-                continue
+            if not comparator(value, values[parent_handle]):
+                break
+
+            heap[pos] = parent_handle
+            positions[parent_handle] = pos
+            pos = parent_pos
 
-            break
-        
-        self._set_position(key, value, pos)
+        heap[pos] = handle
+        positions[handle] = pos
 
     def _sift_up(self, pos: int) -> None:
-        end_pos = len(self._kv_container)
-        start_pos = pos
-        key, value = self._kv_container[pos]
-        child_pos = 2 * pos + 1
+        """ Moves the entry at pos towards the leaves (heapq naming).
+        Promotes the front most child at each level down to a leaf and then sifts the entry back
+        towards pos, which saves a comparison per level as displaced entries mostly belong near the leaves.
+        """
+        heap, values, positions, comparator = self._heap, self._values, self._positions, self._comparator
+        arity, end_pos, start_pos = self._arity, len(self), pos
+        handle = heap[pos]
+        child_pos = arity * pos + 1
 
         while child_pos < end_pos:
-            right_pos = child_pos + 1
-
-            if right_pos < end_pos and not self._comparator(self._kv_container[child_pos][1],
-                    self._kv_container[right_pos][1]):
-                child_pos = right_pos
-            
-            child_key, child_value = self._kv_container[child_pos]
-            self._set_position(child_key, child_value, pos)
+            child_handle = heap[child_pos]
+            child_value = values[child_handle]
+            _child_pos, last_pos = child_pos + 1, min(child_pos + arity, end_pos)
+
+            while _child_pos < last_pos:
+                _child_handle = heap[_child_pos]
+                _child_value = values[_child_handle]
+
+                if comparator(_child_value, child_value):
+                    child_pos, child_handle, child_value = _child_pos, _child_handle, _child_value
+
+                _child_pos += 1
+
+            heap[pos] = child_handle
+            positions[child_handle] = pos
             pos = child_pos
-            child_pos = 2 * pos + 1
-        
-        self._set_position(key, value, pos)
+            child_pos = arity * pos + 1
+
+        heap[pos] = handle
+        positions[handle] = pos
         self._sift_down(start_pos, pos)
 
     def peekitem(self) -> tuple[any, any]:
-        return self._kv_container[0]
+        return self.front()
 
-    def popitem(self) -> tuple[any, any]:
-        key, value = self._kv_container.pop()
+    def nsmallest(self, k: int) -> list[tuple[any, any]]:
+        # Returns the k front most (key, value) items in priority order in O(k log k).
+        return list(islice(self.items(), k))
 
-        if self._kv_container:
-            next_key, next_value = self._kv_container[0]
-            self._set_position(key, value, 0)
-            self._sift_up(0)
+    def merge(self, other: SortedDictBase) -> None:
+        # Melds the (key, value) items of other into the heap, overwriting the values of shared keys.
+        self.update(other._heap_items() if hasattr(other, "_heap_items") else other.items())
 
-            self._kpos_map.pop(next_key)
-            return (next_key, next_value)
-        
-        self._kpos_map.pop(key)
-        return (key, value)
+    def front(self) -> tuple[any, any]:
+        handle = self._heap[0]
+        return (self._keys[handle], self._values[handle])
 
-    def pop(self, key: any, default: any = None) -> any:
-        if key not in self:
-            return default
+    def back(self) -> tuple[any, any]:
+        handle = self._heap[self._back_position()]
+        return (self._keys[handle], self._values[handle])
+
+class DaryPriorityDict (CopyOnWriteMixin, DaryHeapBase):
+    """ Indexed d-ary heap priority dictionary.
+    Keys are interned to integer handles - the heap is an array of handles and the heap position
+    of each handle is kept in a compact int array, such that sift steps only write integers.
+
+    Parameters:
+    :param (callable, opt) _comparator: the priority comparator, e.g. SortedDictBase.min_comparator
+    :param (int, opt) arity: the number of children per node - wider heaps are shallower, trading
+            cheaper insertions and priority increases for more comparisons per pop
+    :param (any, opt) dtype: numeric value dtype, e.g. np.float64 - values are then stored in a typed
+            array (8 bytes per entry instead of a boxed object), otherwise in a list
+
+    Notes:
+    a. from_items() builds a heap in O(n) and update() re-heapifies when a batch is large
+            relative to the heap, instead of sifting each entry.
+    b. Typed values are read back as Python scalars, such that comparisons do not pay for
+            NumPy scalars, and get_values_array() exposes them to NumPy.
+    c. dtype must have an array typecode - bool, datetime64 etc. raise TypeError, use dtype=None instead.
+    """
+    __slots__ = ("_references", "_dtype", "_handles", "_free_handles")
 
-        pos = self._kpos_map[key]
-        value = self._kv_container[pos][1]
-        end_pos = len(self._kv_container) - 1
+    def __init__(self, _comparator: callable = SortedDictBase.min_comparator, arity: int = 4,
+            dtype: any = None) -> None:
+        super().__init__(_comparator, arity)
+        self._dtype = None if dtype is None else np.dtype(dtype)
 
-        if pos == end_pos:
-            self._kv_container.pop()
+        if self._dtype is not None and self._dtype.char not in typecodes:
+            raise TypeError(f"dtype {self._dtype} is not supported - expected an int, uint or float dtype, or None")
+
+        self._handles = dict() # { k: handle }
+        self._keys = [] # [k ...] by handle
+        self._values = [] if dtype is None else array(self._dtype.char) # [v ...] by handle
+        self._positions = array("q") # [pos ...] by handle
+        self._heap = array("q") # [handle ...] d-ary heap
+        self._free_handles = [] # Released handles
+
+    @classmethod
+    def from_items(cls, items: any, _comparator: callable = SortedDictBase.min_comparator, *args, **kwargs):
+        # Constructs the heap from a mapping or iterable of (key, value) pairs in O(n).
+        _priority_dict = cls(_comparator, *args, **kwargs)
+        _priority_dict._assign(items)
+        _priority_dict._heapify()
+
+        return _priority_dict
+
+    def __contains__(self, key: any) -> bool:
+        return key in self._handles
+
+    def __getitem__(self, key: any) -> any:
+        return self._values[self._handles[key]]
+
+    def __setitem__(self, key: any, value: any) -> None:
+        self._own_storage()
+
+        if key not in self._handles:
+            handle = self._new_handle(key, value)
+            self._positions[handle] = len(self._heap)
+            self._heap.append(handle)
+            return self._sift_down(0, len(self._heap) - 1)
+
+        handle = self._handles[key]
+        prev_value = self._values[handle]
+        self._values[handle] = value
+
+        if self._comparator(value, prev_value):
+            self._sift_down(0, self._positions[handle])
         else:
-            end_key, end_value = self._kv_container[end_pos]
-            self._kv_container.pop()
-            self._set_position(end_key, end_value, pos)
+            self._sift_up(self._positions[handle])
+
+    def _new_handle(self, key: any, value: any) -> int:
+        # Stores the value first, such that a value rejected by a typed array leaves no partial entry.
+        if self._free_handles:
+            handle = self._free_handles[-1]
+            self._values[handle] = value
+            self._free_handles.pop()
+            self._keys[handle] = key
+        else:
+            handle = len(self._keys)
+            self._values.append(value)
+            self._keys.append(key)
+            self._positions.append(0)
+
+        self._handles[key] = handle
+        return handle
+
+    def _release_handle(self, handle: int) -> None:
+        self._handles.pop(self._keys[handle])
+        self._keys[handle] = None
+
+        if self._dtype is None:
+            self._values[handle] = None
+
+        self._free_handles.append(handle)
+
+    def _assign(self, items: any) -> None:
+        # Assigns values and appends new keys without restoring the heap invariant.
+        for key, value in (items.items() if hasattr(items, "items") else items):
+            if key in self._handles:
+                self._values[self._handles[key]] = value
+                continue
+
+            handle = self._new_handle(key, value)
+            self._positions[handle] = len(self._heap)
+            self._heap.append(handle)
+
+    def _remove_at(self, pos: int) -> None:
+        handle = self._heap[pos]
+        end_handle = self._heap.pop()
+
+        if end_handle != handle:
+            self._heap[pos] = end_handle
+            self._positions[end_handle] = pos
             self._sift_up(pos)
+            self._sift_down(0, self._positions[end_handle])
+
+        self._release_handle(handle)
+
+    def update(self, items: any) -> None:
+        """ Sets the values of a mapping or iterable of (key, value) pairs.
+        Batches of at least half the heap size are assigned in place and re-heapified in O(n + k)
+        instead of k O(log n) sifts.
+        """
+        self._own_storage()
+        items = list(items.items() if hasattr(items, "items") else items)
+
+        if 2 * len(items) < len(self._heap):
+            for key, value in items:
+                self[key] = value
+            return
+
+        self._assign(items)
+        self._heapify()
+
+    def get_values_array(self) -> np.ndarray:
+        # Returns the values in heap order as a NumPy array.
+        return np.asarray(self._values, dtype=self._dtype)[np.asarray(self._heap, dtype=np.int64)]
+
+    def popitem(self) -> tuple[any, any]:
+        handle = self._heap[0]
+        self._own_storage()
+        key, value = self._keys[handle], self._values[handle]
+        self._remove_at(0)
+
+        return (key, value)
+
+    def pop(self, key: any, default: any = None) -> any:
+        if key not in self._handles:
+            return default
+
+        self._own_storage()
+        handle = self._handles[key]
+        value = self._values[handle]
+        self._remove_at(self._positions[handle])
 
-        self._kpos_map.pop(key)
         return value
-    
-    def front(self) -> tuple[any, any]:
-        return self._kv_container[0]
 
-    def back(self) -> tuple[any, any]:
-        raise Exception() # Back not supported
+    def _copy_storage(self) -> None:
+        self._handles = self._handles.copy()
+        self._keys = self._keys.copy()
+        self._values = self._values[:]
+        self._positions = self._positions[:]
+        self._heap = self._heap[:]
+        self._free_handles = self._free_handles.copy()
+
+class PriorityDict (DaryPriorityDict):
+    # Indexed binary heap priority dictionary.
+    __slots__ = ()
+
+    def __init__(self, _comparator: callable = SortedDictBase.min_comparator, arity: int = 2,
+            dtype: any = None) -> None:
+        super().__init__(_comparator, arity, dtype)
 
 if __name__ == "__main__":
     pass
@@ -0,0 +1,176 @@
+import heapq
+import math
+import time
+from collections import deque
+
+class TimingWheel:
+    """ Hierarchical timing wheel - a time-keyed queue with O(1) push and O(1) amortized expiry.
+    Times are quantized to ticks. Each level is a wheel of 2 ** slot_bits slots, and level l
+    holds the items due within the current rotation of level l + 1, so items cascade down one level
+    at a time as the wheel turns. Items beyond the top level wait in an overflow list.
+
+    Parameters:
+    :param (float, opt) tick: the time resolution in seconds
+    :param (float, opt) start_time: the time of the wheel's first tick, by default time.time()
+    :param (int, opt) slot_bits: log2 of the number of slots per level
+    :param (int, opt) levels: the number of levels - by default 4 levels of 256 slots at 10ms ticks
+            span about 497 days before the overflow list is used
+
+    Notes:
+    a. Items are due at the first tick at or after their time, so they expire up to one tick late
+            but never early. Items due at the same tick expire in insertion order.
+    b. Advancing jumps to the next occupied slot of the lowest occupied level, so long idle gaps cost one
+            step per expiring or cascading slot rather than one per tick or rotation.
+    """
+    def __init__(self, tick: float = 0.01, start_time: float = None, slot_bits: int = 8, levels: int = 4) -> None:
+        self._tick = tick
+        self._bits = slot_bits
+        self._mask = (1 << slot_bits) - 1
+        self._levels = levels
+        self._current = math.floor((time.time() if start_time is None else start_time) / tick)
+        self._wheels = [[[] for _ in range(1 << slot_bits)] for _ in range(levels)] # [[[(tick, item) ...] ...] ...]
+        self._counts = [0] * levels # Number of items by level
+        self._overflow = [] # [(tick, item) ...]
+        self._ready = deque() # [item ...]
+        self._size = 0
+
+    # Accessors
+    def __len__(self) -> int:
+        return self._size
+
+    def __bool__(self) -> bool:
+        return self._size > 0
+
+    def get_time_to_next(self, now: float = None) -> (float | None):
+        """ Returns a lower bound on the time until the next item expires (0 if any item is ready),
+        or None if the wheel is empty.
+        """
+        if not self._size:
+            return None
+
+        if self._ready:
+            return 0.
+
+        now = time.time() if now is None else now
+        return max(self._next_tick() * self._tick - now, 0.)
+
+    def _next_tick(self) -> int:
+        """ Returns the next tick at which a slot expires or cascades, or the overflow list is redistributed.
+        Lower levels only hold ticks within the current rotation of the next level, so the first occupied slot
+        of the lowest occupied level comes first.
+        """
+        for level in range(self._levels):
+            if not self._counts[level]:
+                continue
+
+            shift = self._bits * level
+            slots = self._wheels[level]
+
+            for pos in range(((self._current >> shift) & self._mask) + 1, self._mask + 1):
+                if slots[pos]:
+                    return ((self._current >> (shift + self._bits)) << (shift + self._bits)) | (pos << shift)
+
+        return ((self._current >> (self._bits * self._levels)) + 1) << (self._bits * self._levels)
+
+    # Mutators
+    def push(self, item: any, _time: float) -> None:
+        self._size += 1
+        self._place(math.ceil(_time / self._tick), item)
+
+    def _place(self, tick: int, item: any) -> None:
+        if tick <= self._current:
+            return self._ready.append(item)
+
+        # Lowest level whose next level's current rotation contains tick
+        level = ((tick ^ self._current).bit_length() - 1) // self._bits
+
+        if level < self._levels:
+            self._wheels[level][(tick >> (self._bits * level)) & self._mask].append((tick, item))
+            self._counts[level] += 1
+        else:
+            self._overflow.append((tick, item))
+
+    def _cascade(self, level: int) -> None:
+        # Redistributes the current slot of level to the lower levels.
+        slots = self._wheels[level]
+        pos = (self._current >> (self._bits * level)) & self._mask
+        entries, slots[pos] = slots[pos], []
+        self._counts[level] -= len(entries)
+
+        for tick, item in entries:
+            self._place(tick, item)
+
+    def advance(self, now: float = None) -> None:
+        # Turns the wheel up to the tick of now, moving due items to the ready queue.
+        target = math.floor((time.time() if now is None else now) / self._tick)
+
+        while self._current < target:
+            if self._size == len(self._ready): # Nothing left to turn
+                self._current = target
+                break
+
+            self._current = min(self._next_tick(), target)
+
+            if not self._current & ((1 << (self._bits * self._levels)) - 1):
+                overflow, self._overflow = self._overflow, []
+
+                for tick, item in overflow:
+                    self._place(tick, item)
+
+            for level in reversed(range(1, self._levels)):
+                if not self._current & ((1 << (self._bits * level)) - 1):
+                    self._cascade(level)
+
+            slot = self._wheels[0][self._current & self._mask]
+
+            if slot:
+                self._counts[0] -= len(slot)
+                self._ready.extend(item for _, item in slot)
+                slot.clear()
+
+    def expire(self, now: float = None) -> any:
+        # Advances the wheel to now and yields the due items in expiry order.
+        self.advance(now)
+
+        while self._ready:
+            self._size -= 1
+            yield self._ready.popleft()
+
+class TimingHeap:
+    """ Binary heap time-keyed queue with the TimingWheel interface - O(log n) push and expiry, but exact times.
+
+    Notes:
+    a. Items are due at their time, and items due at the same time expire in insertion order.
+    """
+    def __init__(self) -> None:
+        self._heap = [] # [(time, order, item) ...]
+        self._order = 0
+
+    # Accessors
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __bool__(self) -> bool:
+        return len(self._heap) > 0
+
+    def get_time_to_next(self, now: float = None) -> (float | None):
+        # Returns the time until the next item expires (0 if any item is ready), or None if the heap is empty.
+        if not self._heap:
+            return None
+
+        return max(self._heap[0][0] - (time.time() if now is None else now), 0.)
+
+    # Mutators
+    def push(self, item: any, _time: float) -> None:
+        self._order += 1
+        heapq.heappush(self._heap, (_time, self._order, item))
+
+    def expire(self, now: float = None) -> any:
+        # Yields the due items in expiry order.
+        now = time.time() if now is None else now
+
+        while self._heap and self._heap[0][0] <= now:
+            yield heapq.heappop(self._heap)[2]
+
+if __name__ == "__main__":
+    pass
\ No newline at end of file
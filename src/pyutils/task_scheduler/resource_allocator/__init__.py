@@ -112,22 +112,19 @@ class ResourceAllocator (ResourceAllocatorBase):
         while _ready_queue:
             task_key, units = _ready_queue.front()
 
-            for resource_key, capacity in _resources_capacity.items():
-                if capacity >= units: # Sufficient capacity
-                    _ready_allocation[task_key] = resource_key
-                    _resources_capacity[resource_key] = (capacity - units)
-                    _ready_queue.popitem()
-                    break
-
-            if not task_key in _ready_allocation:
+            fit = _resources_capacity.first_at_least(units) # Best fit in O(log n)
+
+            if fit is None:
                 break # Cannot allocate any more requests
-    
-        unallocated_requests = 0
 
-        for _, units in _ready_queue._kv_container: # Order does not matter
-            unallocated_requests += units
+            resource_key, capacity = fit
+            _ready_allocation[task_key] = resource_key
+            _resources_capacity[resource_key] = (capacity - units)
+            _ready_queue.popitem()
+    
+        unallocated_requests = int(_ready_queue.get_values_array().sum()) # Heap order in O(n)
 
-        _, max_capacity = _resources_capacity._kv_container[-1]
+        _, max_capacity = _resources_capacity.front()
         return _ready_allocation, unallocated_requests, max_capacity
 
     def dequeue_and_allocate(self, net_capacity: int, max_capacity: int) -> None:
@@ -33,6 +33,9 @@ class Task (WrappedFunction):
         return self._start_time < other._start_time
 
     # Accessors
+    def get_start_time(self) -> float:
+        return self._start_time
+
     def get_time_to_ready(self) -> float:
         return max(time.time() - self._start_time, 0)
 
@@ -1,6 +1,6 @@
-import heapq
 from multiprocessing import Queue
 from multiprocessing.managers import SyncManager
+from sorted_dict.timing_wheel import TimingHeap, TimingWheel
 from task_scheduler.task import Task
 
 class TaskManagerProxy:
@@ -15,16 +15,24 @@ class TaskManagerProxy:
             return self._new_task_queue.put(task)
 
 class TaskManager (TaskManagerProxy):
-    def __init__(self, sync_manager: SyncManager) -> None:
-        self._waiting_queue = [] # [task ...]
+    def __init__(self, sync_manager: SyncManager, waiting_queue: (TimingWheel | TimingHeap) = None) -> None:
+        """ Parameters:
+        :sync_manager (SyncManager): The manager providing the new task queue.
+        :waiting_queue (TimingWheel | TimingHeap, opt): The time-keyed queue of waiting tasks, e.g. TimingWheel(tick=0.01)
+                for O(1) pushes and expiry with many repeating tasks. Defaults to a TimingHeap.
+
+        Notes:
+        a. Tasks are yielded once the time reaches their start time, rather than after it (Task.ready()).
+        b. get_time_to_update() is the time until the next start time capped at 5 seconds, rather than
+                Task.get_time_to_ready() of the first task, which is 0 until the task is ready.
+        """
+        self._waiting_queue = TimingHeap() if waiting_queue is None else waiting_queue
         TaskManagerProxy.__init__(self, sync_manager.Queue())
 
     # Accessors
     def get_time_to_update(self) -> float:
-        if self._waiting_queue:
-            return self._waiting_queue[0].get_time_to_ready()
-        
-        return 5
+        time_to_next = self._waiting_queue.get_time_to_next()
+        return 5 if time_to_next is None else min(time_to_next, 5)
 
     def get_proxy(self) -> TaskManagerProxy:
         return TaskManagerProxy(self._new_task_queue)
@@ -34,12 +42,11 @@ class TaskManager (TaskManagerProxy):
         while not self._new_task_queue.empty():
             # Process new tasks
             task = self._new_task_queue.get()
-            heapq.heappush(self._waiting_queue, task)
+
+            self._waiting_queue.push(task, task.get_start_time())
 
     def __iter__(self) -> Task:
-        while self._waiting_queue and self._waiting_queue[0].ready():
-            task = heapq.heappop(self._waiting_queue)
-            yield task
+        yield from self._waiting_queue.expire()
 
 if __name__ == "__main__":
     pass
\ No newline at end of file
@@ -0,0 +1,6 @@
+import os
+import sys
+
+# Imports pyutils from the source tree when it is not installed, and the reference models from the benchmarks
+ROOT_DPATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [os.path.join(ROOT_DPATH, "src"), os.path.join(ROOT_DPATH, "benchmarks")]
@@ -0,0 +1,122 @@
+import pytest
+import random
+from pyutils.sorted_dict import SortedDictBase, SortedDict
+from pyutils.sorted_dict.priority_dict import PriorityDict, DaryPriorityDict
+from sorted_dict_benchmark import ReferencePriorityDict, ReferenceSortedDict
+
+COMPARATORS = [SortedDictBase.min_comparator, SortedDictBase.max_comparator]
+SEEDS = range(10)
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_sorted_dict_differential(seed: int, steps: int = 2000, n_keys: int = 64, block_size: int = 4) -> None:
+    """ Runs a random operation sequence against SortedDict and ReferenceSortedDict and asserts equal results.
+    A small block size exercises block splits, merges and the rank index.
+    """
+    random_state = random.Random(seed)
+
+    for _comparator in COMPARATORS:
+        sorted_dict_type = type("SortedDict", (SortedDict,), {"__slots__": (), "_BLOCK_SIZE": block_size})
+        sorted_dict, reference = sorted_dict_type(_comparator), ReferenceSortedDict(_comparator)
+        snapshots = [] # [(copy, items at copy time) ...]
+
+        for _ in range(steps):
+            operation = random_state.random()
+            key, value = random_state.randrange(n_keys), random_state.randrange(n_keys >> 1)
+
+            if operation < .45:
+                sorted_dict[key] = value
+                reference[key] = value
+            elif operation < .65:
+                assert sorted_dict.pop(key, "-") == reference.pop(key, "-")
+            elif operation < .75 and reference:
+                assert sorted_dict.popitem() == reference.popitem()
+            elif operation < .8:
+                snapshots.append((sorted_dict.copy(), reference.items()))
+
+            items = reference.items()
+            assert list(sorted_dict.items()) == items and len(sorted_dict) == len(reference)
+            assert (key in sorted_dict) == (key in reference)
+            assert len(sorted_dict._entries) == len(reference) # No stale keys
+
+            if key in reference:
+                assert sorted_dict[key] == reference[key]
+                assert sorted_dict.rank(key) == reference.rank(key)
+
+            if reference:
+                assert sorted_dict.front() == reference.front() and sorted_dict.back() == reference.back()
+
+            low, high = sorted([value, random_state.randrange(n_keys >> 1)],
+                    reverse=_comparator is SortedDictBase.max_comparator)
+            _items = [(_key, _value) for _key, _value in items
+                    if not _comparator(_value, low) and not _comparator(high, _value)]
+            assert list(sorted_dict.irange(low, high)) == _items
+            assert sorted_dict.count_between(low, high) == len(_items)
+            assert sorted_dict.bisect_value(low) == sum(1 for _, _value in items if _comparator(_value, low))
+            assert sorted_dict.first_at_least(low) == next(
+                    ((_key, _value) for _key, _value in items if not _comparator(_value, low)), None)
+
+        for snapshot, items in snapshots:
+            assert list(snapshot.items()) == items # Unaffected by later mutations
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_priority_dict_differential(seed: int, steps: int = 2000, n_keys: int = 64) -> None:
+    # Runs a random operation sequence against PriorityDict/DaryPriorityDict and ReferencePriorityDict.
+    random_state = random.Random(seed)
+
+    for _comparator in COMPARATORS:
+        for priority_dict in [PriorityDict(_comparator), DaryPriorityDict(_comparator, 3)]:
+            reference = ReferencePriorityDict(_comparator)
+
+            for _ in range(steps):
+                operation = random_state.random()
+                key, value = random_state.randrange(n_keys), random_state.randrange(n_keys >> 1)
+
+                if operation < .4:
+                    priority_dict[key] = value
+                    reference[key] = value
+                elif operation < .6:
+                    assert priority_dict.pop(key, "-") == reference.pop(key, "-")
+                elif operation < .75 and reference:
+                    _key, _value = priority_dict.popitem()
+                    assert reference.pop(_key) == _value
+                    assert all(not _comparator(__value, _value) for _, __value in reference.items())
+                elif operation < .8:
+                    items = {random_state.randrange(n_keys): random_state.randrange(n_keys >> 1)
+                            for _ in range(random_state.randrange(n_keys))}
+                    other = PriorityDict.from_items(items, _comparator)
+                    snapshot = priority_dict.copy()
+                    priority_dict.merge(other)
+                    assert sorted(snapshot.values()) == sorted(value for _, value in reference.items())
+
+                    for _key, _value in items.items():
+                        reference[_key] = _value
+
+                items = reference.items()
+                assert sorted(priority_dict.items()) == sorted(items) and len(priority_dict) == len(reference)
+                assert [value for _, value in priority_dict.items()] == [value for _, value in items]
+                assert len(priority_dict._handles) == len(reference) # No stale keys
+
+                if reference:
+                    assert priority_dict.front()[1] == items[0][1] and priority_dict.back()[1] == items[-1][1]
+
+@pytest.mark.parametrize("dict_type", [SortedDict, DaryPriorityDict])
+def test_copy_release(dict_type: type, size: int = 1000) -> None:
+    # Asserts that copy -> del -> mutate does not copy the storage, i.e. dropped snapshots release their reference.
+    storage_copies = []
+    counting_type = type(dict_type.__name__, (dict_type,), {
+        "__slots__": (),
+        "_copy_storage": lambda self: (storage_copies.append(self), super(counting_type, self)._copy_storage())
+    })
+    sorted_dict = counting_type()
+
+    for key in range(size):
+        sorted_dict[key] = key
+
+    snapshot = sorted_dict.copy()
+    del snapshot
+    sorted_dict[0] = -1
+    assert not storage_copies
+
+    snapshot = sorted_dict.copy()
+    sorted_dict[0] = -2 # Shared - copies once
+    assert len(storage_copies) == 1 and snapshot[0] == -1